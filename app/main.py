@@ -1,10 +1,23 @@
 from fastapi import FastAPI, HTTPException, Body
 from fastapi.middleware.cors import CORSMiddleware
-from typing import List, Dict, Any, Optional
+from fastapi.responses import ORJSONResponse
+from typing import List, Dict, Any, Callable, Optional, Tuple, NamedTuple
 import uvicorn
+import os
 from datetime import datetime, timedelta
 import logging
+import math
 import json
+import asyncio
+import threading
+import hashlib
+import heapq
+from collections import OrderedDict
+from datetime import date
+from functools import lru_cache
+from bisect import bisect_right
+from operator import itemgetter
+import numpy as np
 
 # BIBLIOTECAS ASTROLÓGICAS CORRETAS
 try:
@@ -29,11 +42,144 @@ try:
 except ImportError:
     SKYFIELD_DISPONIVEL = False
 
+# Inicialização do Swiss Ephemeris (set_ephe_path) serializada; calc_ut não precisa de lock
+_swe_init_lock = threading.Lock()
+
 # Configurar logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="API Trânsitos Astrológicos PRECISOS", version="12.2.0")
+class PosicaoPlaneta(NamedTuple):
+    """Posição de um planeta numa data (tupla leve no lugar de dict)"""
+    longitude: float
+    signo: str
+    grau_no_signo: float
+    velocidade: float
+    retrogrado: bool
+
+def _formatar_data(data: datetime) -> str:
+    """Formata data como YYYY-MM-DD sem passar por strftime"""
+    return f"{data.year:04d}-{data.month:02d}-{data.day:02d}"
+
+# ============================================================
+# NÚCLEOS NUMÉRICOS
+# ============================================================
+
+def _casa_por_limites(longitude, limites, casas):
+    """Busca binária da casa nos limites ordenados das cúspides; antes da menor cúspide volta para a casa que cruza 0°"""
+    return casas[(bisect_right(limites, longitude % 360) - 1) % 12]
+
+def _primeiro_dia_com_estado(estado_no_dia: Callable[[int], Optional[bool]], inicio: int, fim: int,
+                             estado: bool, passo: int = 7) -> Optional[int]:
+    """
+    Primeiro dia em [inicio, fim) com estado_no_dia(dia) == estado, ou None. Amostra a cada `passo` dias
+    (e o último dia) e refina por bisseção entre a última amostra no outro estado e a primeira no estado
+    buscado: o resultado é o da varredura dia a dia quando nenhum trecho dura menos que `passo` dias.
+    Dia sem estado (None) levanta LookupError
+    """
+    amostras = list(range(inicio, fim, passo))
+    if amostras and amostras[-1] != fim - 1:
+        amostras.append(fim - 1)
+    
+    anterior = None
+    for dia in amostras:
+        estado_dia = estado_no_dia(dia)
+        if estado_dia is None:
+            raise LookupError(dia)
+        if estado_dia == estado:
+            if anterior is None:
+                return dia
+            # Bisseção entre a última amostra no outro estado e esta
+            while dia - anterior > 1:
+                meio = (anterior + dia) // 2
+                estado_meio = estado_no_dia(meio)
+                if estado_meio is None:
+                    raise LookupError(meio)
+                if estado_meio == estado:
+                    dia = meio
+                else:
+                    anterior = meio
+            return dia
+        anterior = dia
+    return None
+
+@lru_cache(maxsize=256)
+def _limites_cuspides(graus_cuspides: tuple, numeros_casas: tuple):
+    """Limites ordenados das cúspides e casas correspondentes; o mesmo mapa reaproveita os arrays entre requisições"""
+    graus = np.array(graus_cuspides, dtype=np.float64) % 360
+    casas = np.array(numeros_casas, dtype=np.int32)
+    
+    # Rotacionar para que limites[0] seja o menor grau (casa que cruza 0° fica no fim)
+    inicio = int(np.argmin(graus))
+    limites = np.roll(graus, -inicio)
+    casas = np.roll(casas, -inicio)
+    
+    # Cúspides fora de ordem zodiacal não permitem busca binária
+    if np.any(np.diff(limites) < 0):
+        return None, None
+    
+    # Arrays compartilhados pelo cache: somente leitura
+    limites.setflags(write=False)
+    casas.setflags(write=False)
+    return limites, casas
+
+@lru_cache(maxsize=None)
+def _inicializar_swisseph() -> bool:
+    """Configura o path das efemérides do Swiss Ephemeris uma única vez por processo (chamada na carga do módulo)"""
+    if not SWISSEPH_DISPONIVEL:
+        return False
+    
+    # set_ephe_path troca o estado global da biblioteca: só uma thread por vez
+    with _swe_init_lock:
+        return _configurar_path_swisseph()
+
+def _configurar_path_swisseph() -> bool:
+    """Testa os paths de efemérides possíveis e mantém o primeiro que funciona"""
+    try:
+        # Tentar diferentes paths (SE_EPHE_PATH primeiro, quando definido)
+        paths_possiveis = [
+            os.environ.get('SE_EPHE_PATH'),
+            '/usr/share/swisseph',
+            '/usr/local/share/swisseph',
+            './swisseph',
+            '~/swisseph',
+            ''  # Path padrão
+        ]
+        
+        for path in paths_possiveis:
+            if path is None:
+                continue
+            try:
+                swe.set_ephe_path(path)
+                # Testar se funciona calculando posição do Sol
+                jd = swe.julday(2025, 7, 17)
+                swe.calc_ut(jd, swe.SUN)
+                
+                # Abrir os arquivos de efemérides de todos os corpos já na inicialização,
+                # e não na primeira requisição
+                for id_swe in (swe.MOON, swe.MERCURY, swe.VENUS, swe.MARS, swe.JUPITER,
+                               swe.SATURN, swe.URANUS, swe.NEPTUNE, swe.PLUTO):
+                    swe.calc_ut(jd, id_swe)
+                
+                logger.info("Swiss Ephemeris inicializado com path: %s", path if path else 'padrão')
+                return True
+            except Exception as e:
+                logger.debug("Path %s falhou: %s", path, e)
+                continue
+        
+        logger.warning("Nenhum path válido encontrado para Swiss Ephemeris")
+        return False
+    except Exception as e:
+        logger.error("Erro ao inicializar Swiss Ephemeris: %s", e)
+        return False
+
+_inicializar_swisseph()
+
+app = FastAPI(
+    title="API Trânsitos Astrológicos PRECISOS",
+    version="12.2.0",
+    default_response_class=ORJSONResponse
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -45,10 +191,13 @@ app.add_middleware(
 
 class TransitoAstrologicoPreciso:
     def __init__(self):
-        self.signos = [
+        self.signos = (
             'Áries', 'Touro', 'Gêmeos', 'Câncer', 'Leão', 'Virgem',
             'Libra', 'Escorpião', 'Sagitário', 'Capricórnio', 'Aquário', 'Peixes'
-        ]
+        )
+        
+        # Índice de cada signo (evita busca linear em self.signos)
+        self._signo_idx = {s: i for i, s in enumerate(self.signos)}
         
         # Mapeamento para variações de escrita
         self.signos_normalizados = {
@@ -87,6 +236,12 @@ class TransitoAstrologicoPreciso:
             }
         }
         
+        # Entradas em signo calibradas, já formatadas: (planeta, signo) -> data
+        self.entradas_calibradas = {
+            ('Saturno', 'Áries'): _formatar_data(self.calibracao_cliente['Saturno']['entrada_aries']),
+            ('Urano', 'Gêmeos'): _formatar_data(self.calibracao_cliente['Urano']['entrada_gemeos'])
+        }
+        
         # Mapeamento para Swiss Ephemeris
         if SWISSEPH_DISPONIVEL:
             self.planetas_swe = {
@@ -125,48 +280,72 @@ class TransitoAstrologicoPreciso:
             (120, "trígono", 5),      # Orbe 5°
             (180, "oposição", 5)      # Orbe 5°
         ]
+        self._angulos_aspectos = np.array([a[0] for a in self.aspectos], dtype=np.float64)
+        self._orbes_aspectos = np.array([a[2] for a in self.aspectos], dtype=np.float64)
         
-        # Planetas relevantes para trânsitos
-        self.planetas_relevantes = ['Mercúrio', 'Vênus', 'Marte', 'Júpiter', 'Saturno', 'Urano', 'Netuno', 'Plutão']
+        # Velocidade geocêntrica máxima (graus/dia), com margem sobre o observado em 1950-2100
+        self.velocidade_maxima = {
+            'Mercúrio': 2.25,
+            'Vênus': 1.3,
+            'Marte': 0.8,
+            'Júpiter': 0.25,
+            'Saturno': 0.14,
+            'Urano': 0.07,
+            'Netuno': 0.045,
+            'Plutão': 0.045
+        }
+        
+        # Planetas relevantes para trânsitos (usado só em testes de pertinência)
+        self.planetas_relevantes = frozenset(['Mercúrio', 'Vênus', 'Marte', 'Júpiter', 'Saturno', 'Urano', 'Netuno', 'Plutão'])
+        
+        # Pares (nome, id Swiss Ephemeris) dos planetas relevantes, resolvidos uma única vez
+        self.planetas_swe_relevantes = [
+            (nome_planeta, id_swe) for nome_planeta, id_swe in self.planetas_swe.items()
+            if nome_planeta in self.planetas_relevantes
+        ] if SWISSEPH_DISPONIVEL else []
         
         # ✅ v12.2: Cache para cúspides
         self.cuspides_cache = None
         
-        # Inicializar Swiss Ephemeris
-        self.inicializar_swisseph()
+        # Limites das cúspides preparados para busca binária (cache por lista)
+        self._casas_preparadas = None
+        
+        # Dados dos planetas natais extraídos uma vez por requisição (cache por lista)
+        self._natais_preparados = None
+        self._planetas_natais_preparados = None
+        
+        # Memoização das posições por (planeta, data): as varreduras de retrogradação,
+        # casas e aspectos amostram as mesmas datas a partir da data de referência
+        self.calcular_posicao_planeta_swisseph = lru_cache(maxsize=65536)(self.calcular_posicao_planeta_swisseph)
+        self.calcular_posicao_planeta_ephem = lru_cache(maxsize=65536)(self.calcular_posicao_planeta_ephem)
+        
+        # Mesma memoização nas posições por data numérica (dia juliano / data do PyEphem), usadas
+        # pelas grades diárias e varreduras de signo que não passam por datetime
+        self._posicao_swisseph_jd = lru_cache(maxsize=65536)(self._posicao_swisseph_jd)
+        self._posicao_ephem_data = lru_cache(maxsize=65536)(self._posicao_ephem_data)
+        
+        # Corpos do PyEphem guardam o estado do último compute(): cada thread usa suas próprias instâncias
+        self._ephem_local = threading.local()
+        
+        # Grade diária de posições por (planeta, data inicial, dias), compartilhada pelas varreduras anuais
+        self._grade_posicoes = lru_cache(maxsize=64)(self._grade_posicoes)
+        
+        # Primeira retrogradação por (planeta, data de referência, janela), repetida entre requisições
+        self._primeira_retrogradacao = lru_cache(maxsize=256)(self._primeira_retrogradacao)
+        
+        # Memoização das entradas/saídas de signo por (planeta, signo, data de referência): o resultado
+        # depende só desses argumentos e se repete entre requisições
+        self.calcular_entrada_signo_precisa = lru_cache(maxsize=256)(self.calcular_entrada_signo_precisa)
+        self.calcular_saida_signo_precisa = lru_cache(maxsize=256)(self.calcular_saida_signo_precisa)
+        
+        # Memoização dos cálculos autônomos por (planeta, signo, dia)
+        self.calcular_entrada_signo_autonoma = lru_cache(maxsize=256)(self.calcular_entrada_signo_autonoma)
+        self.calcular_saida_signo_autonoma = lru_cache(maxsize=256)(self.calcular_saida_signo_autonoma)
+        self.detectar_retrogradacoes_autonomas = lru_cache(maxsize=256)(self.detectar_retrogradacoes_autonomas)
     
     def inicializar_swisseph(self):
-        """Inicializa Swiss Ephemeris com configuração robusta"""
-        if SWISSEPH_DISPONIVEL:
-            try:
-                # Tentar diferentes paths
-                paths_possiveis = [
-                    '/usr/share/swisseph',
-                    '/usr/local/share/swisseph',
-                    './swisseph',
-                    '~/swisseph',
-                    ''  # Path padrão
-                ]
-                
-                for path in paths_possiveis:
-                    try:
-                        swe.set_ephe_path(path)
-                        # Testar se funciona calculando posição do Sol
-                        jd = swe.julday(2025, 7, 17)
-                        resultado = swe.calc_ut(jd, swe.SUN)
-                        
-                        logger.info(f"Swiss Ephemeris inicializado com path: {path if path else 'padrão'}")
-                        return True
-                    except Exception as e:
-                        logger.debug(f"Path {path} falhou: {e}")
-                        continue
-                
-                logger.warning("Nenhum path válido encontrado para Swiss Ephemeris")
-                return False
-            except Exception as e:
-                logger.error(f"Erro ao inicializar Swiss Ephemeris: {e}")
-                return False
-        return False
+        """Inicializa Swiss Ephemeris com configuração robusta (já feito na carga do módulo; mantido para compatibilidade)"""
+        return _inicializar_swisseph()
     
     # ============================================================
     # CORREÇÃO v12.2: FUNÇÕES COMPLETAMENTE REVISADAS
@@ -224,25 +403,25 @@ class TransitoAstrologicoPreciso:
                     if movimento_casas:
                         resultado['movimento_casas'] = movimento_casas
                     
-                    logger.debug(f"[v12.2] {nome}: Casa atual={casa_atual}, Movimento={len(movimento_casas)} casas")
+                    logger.debug("[v12.2] %s: Casa atual=%s, Movimento=%s casas", nome, casa_atual, len(movimento_casas))
                     
                 except Exception as e:
-                    logger.warning(f"[v12.2] Erro ao calcular movimento de casas para {nome}: {e}")
+                    logger.warning("[v12.2] Erro ao calcular movimento de casas para %s: %s", nome, e)
             
             # Aspectos com duração (manter como está)
-            aspectos_duracao = self.calcular_duracao_aspectos(planeta, natais, self.data_referencia)
+            aspectos_duracao = self.calcular_duracao_aspectos(planeta, natais, self.data_referencia, limite=5)
             if aspectos_duracao:
-                resultado['aspectos_com_duracao'] = aspectos_duracao[:5]
+                resultado['aspectos_com_duracao'] = aspectos_duracao
             
             # Aspectos principais (manter como está)
-            aspectos = self.calcular_aspectos_precisos(planeta, natais)
+            aspectos = self.calcular_aspectos_precisos(planeta, natais, limite=5)
             if aspectos:
-                resultado['aspectos_principais'] = aspectos[:5]
+                resultado['aspectos_principais'] = aspectos
             
             return resultado
             
         except Exception as e:
-            logger.error(f"[v12.2] Erro ao processar {planeta.get('name', 'Desconhecido')}: {e}")
+            logger.error("[v12.2] Erro ao processar %s: %s", planeta.get('name', 'Desconhecido'), e)
             return {
                 'signo_atual': planeta.get('sign', 'Áries'),
                 'grau_atual': round(float(planeta.get('normDegree', 0)), 2),
@@ -272,7 +451,7 @@ class TransitoAstrologicoPreciso:
                     # Saturno retrogrará de ~1° Áries para ~28° Peixes
                     casa_destino = 3 if cuspides else 4  # Casa 3 ou 4 dependendo das cúspides
                     retrogradacoes.append({
-                        'data_inicio': cal['retrogradacao_inicio'].strftime('%Y-%m-%d'),
+                        'data_inicio': _formatar_data(cal['retrogradacao_inicio']),
                         'data_fim': '2026-01-15',
                         'duracao_dias': 136,
                         'signo_destino': 'Peixes',
@@ -285,7 +464,7 @@ class TransitoAstrologicoPreciso:
                     # Casa 6 volta para Casa 5
                     casa_destino = 5 if cuspides else 6
                     retrogradacoes.append({
-                        'data_inicio': cal['retrogradacao_inicio'].strftime('%Y-%m-%d'),
+                        'data_inicio': _formatar_data(cal['retrogradacao_inicio']),
                         'data_fim': '2026-04-10',
                         'duracao_dias': 153,
                         'signo_destino': 'Touro',
@@ -298,8 +477,8 @@ class TransitoAstrologicoPreciso:
                     # Mercúrio em Leão está na Casa 8
                     casa_destino = 8 if cuspides else 8
                     retrogradacoes.append({
-                        'data_inicio': retro['inicio'].strftime('%Y-%m-%d'),
-                        'data_fim': retro['fim'].strftime('%Y-%m-%d'),
+                        'data_inicio': _formatar_data(retro['inicio']),
+                        'data_fim': _formatar_data(retro['fim']),
                         'duracao_dias': (retro['fim'] - retro['inicio']).days,
                         'signo_destino': 'Leão',
                         'casa_destino': casa_destino
@@ -308,62 +487,82 @@ class TransitoAstrologicoPreciso:
                 if retrogradacoes:
                     return retrogradacoes
             
-            logger.debug(f"[v12.2] Detectando retrogradação de {planeta} a partir de {data_ref}")
+            logger.debug("[v12.2] Detectando retrogradação de %s a partir de %s", planeta, data_ref)
             
             retrogradacoes = []
-            em_retrogradacao = False
-            inicio_retro = None
             
-            # Verificar próximos 400 dias
-            for dias in range(0, 400):
-                data_teste = data_ref + timedelta(days=dias)
+            # Primeira retrogradação nos próximos 400 dias: primeiro dia retrógrado e primeiro dia direto depois dele
+            dias_retrogradacao = self._primeira_retrogradacao(planeta, data_ref, 400)
+            
+            if dias_retrogradacao:
+                inicio_retro = data_ref + timedelta(days=dias_retrogradacao[0])
+                data_teste = data_ref + timedelta(days=dias_retrogradacao[1])
+                logger.debug("%s iniciará retrogradação em %s", planeta, inicio_retro)
                 
-                pos = self.calcular_posicao_planeta_swisseph(planeta, data_teste)
-                if not pos:
-                    continue
+                # Fim da retrogradação - calcular destino
+                pos_final = self.calcular_posicao_planeta(planeta, data_teste)
                 
-                eh_retrogrado = pos.get('retrogrado', False) or pos.get('velocidade', 0) < 0
+                # ✅ v12.2: Usar cúspides reais se disponíveis
+                if cuspides and pos_final:
+                    casa_final = self.determinar_casa_por_cuspides(pos_final.longitude, cuspides)
+                else:
+                    # Fallback: estimar casa baseado no signo
+                    casa_final = int((pos_final.longitude / 30) + 1) % 12 + 1
+                
+                retrogradacao = {
+                    'data_inicio': _formatar_data(inicio_retro),
+                    'data_fim': _formatar_data(data_teste),
+                    'duracao_dias': (data_teste - inicio_retro).days,
+                    'signo_destino': pos_final.signo,
+                    'casa_destino': casa_final
+                }
+                retrogradacoes.append(retrogradacao)
                 
-                if eh_retrogrado and not em_retrogradacao:
-                    # Início da retrogradação
-                    inicio_retro = data_teste
-                    em_retrogradacao = True
-                    logger.debug(f"{planeta} iniciará retrogradação em {inicio_retro}")
-                    
-                elif not eh_retrogrado and em_retrogradacao:
-                    # Fim da retrogradação - calcular destino
-                    pos_final = self.calcular_posicao_planeta_swisseph(planeta, data_teste)
-                    if not pos_final:
-                        pos_final = self.calcular_posicao_planeta_ephem(planeta, data_teste)
-                    
-                    # ✅ v12.2: Usar cúspides reais se disponíveis
-                    if cuspides and pos_final:
-                        casa_final = self.determinar_casa_por_cuspides(pos_final.get('longitude', 0), cuspides)
-                    else:
-                        # Fallback: estimar casa baseado no signo
-                        casa_final = int((pos_final.get('longitude', 0) / 30) + 1) % 12 + 1
-                    
-                    retrogradacao = {
-                        'data_inicio': inicio_retro.strftime('%Y-%m-%d'),
-                        'data_fim': data_teste.strftime('%Y-%m-%d'),
-                        'duracao_dias': (data_teste - inicio_retro).days,
-                        'signo_destino': pos_final.get('signo', 'N/A'),
-                        'casa_destino': casa_final
-                    }
-                    retrogradacoes.append(retrogradacao)
-                    
-                    logger.debug(f"[v12.2] {planeta} terminará retrogradação em {data_teste}, casa destino: {casa_final}")
-                    em_retrogradacao = False
-                    
-                    # Encontrar apenas a primeira retrogradação
-                    break
+                logger.debug("[v12.2] %s terminará retrogradação em %s, casa destino: %s", planeta, data_teste, casa_final)
             
             return retrogradacoes
             
         except Exception as e:
-            logger.error(f"[v12.2] Erro ao detectar retrogradação: {e}")
+            logger.error("[v12.2] Erro ao detectar retrogradação: %s", e)
             return []
     
+    def _primeira_retrogradacao(self, planeta: str, data_ref: datetime, dias: int) -> Optional[Tuple[int, int]]:
+        """
+        Dias (a partir de data_ref) do início e do fim da primeira retrogradação dentro de `dias`, ou None.
+        A velocidade é amostrada a cada 7 dias e cada mudança de sentido é refinada por bisseção na
+        semana (retrogradações e trechos diretos duram bem mais de 7 dias); com dias sem posição,
+        volta para a grade diária completa
+        """
+        jd_ref = None
+        if SWISSEPH_DISPONIVEL and planeta in self.planetas_swe:
+            jd_ref = swe.julday(data_ref.year, data_ref.month, data_ref.day, data_ref.hour + data_ref.minute/60.0)
+        data_ephem_ref = None
+        if PYEPHEM_DISPONIVEL and planeta in self.planetas_ephem:
+            data_ephem_ref = float(ephem.Date(data_ref))
+        
+        def retrogrado_no_dia(dia: int) -> Optional[bool]:
+            pos = self._posicao_swisseph_jd(planeta, jd_ref + dia) if jd_ref is not None else None
+            if not pos and data_ephem_ref is not None:
+                pos = self._posicao_ephem_data(planeta, data_ephem_ref + dia)
+            return pos.velocidade < 0 if pos else None
+        
+        try:
+            inicio_retro = _primeiro_dia_com_estado(retrogrado_no_dia, 0, dias, True)
+            fim_retro = _primeiro_dia_com_estado(retrogrado_no_dia, inicio_retro, dias, False) if inicio_retro is not None else None
+            return (inicio_retro, fim_retro) if fim_retro is not None else None
+            
+        except LookupError:
+            # Grade diária; dias sem posição não alteram o estado
+            _, velocidades = self._grade_posicoes(planeta, data_ref, dias)
+            dias_validos = np.flatnonzero(~np.isnan(velocidades))
+            retrogrado = velocidades[dias_validos] < 0
+            
+            dias_retro = np.flatnonzero(retrogrado)
+            dias_direto = np.flatnonzero(~retrogrado[dias_retro[0]:]) if len(dias_retro) else []
+            if not len(dias_direto):
+                return None
+            return int(dias_validos[dias_retro[0]]), int(dias_validos[dias_retro[0] + dias_direto[0]])
+    
     def calcular_movimento_casas_com_cuspides(self, planeta: str, data_inicio: datetime, 
                                               periodo_dias: int, cuspides: List[Dict]) -> List[Dict]:
         """
@@ -372,58 +571,50 @@ class TransitoAstrologicoPreciso:
         """
         try:
             movimento_casas = []
-            casa_atual = None
-            entrada_casa = None
             
-            logger.debug(f"[v12.2] Calculando movimento de {planeta} por {periodo_dias} dias com cúspides reais")
+            logger.debug("[v12.2] Calculando movimento de %s por %s dias com cúspides reais", planeta, periodo_dias)
             
-            # Verificar casa a cada 7 dias
-            for dia in range(0, periodo_dias, 7):
-                data_teste = data_inicio + timedelta(days=dia)
-                
-                # Calcular posição do planeta
-                pos = self.calcular_posicao_planeta_swisseph(planeta, data_teste)
-                if not pos:
-                    pos = self.calcular_posicao_planeta_ephem(planeta, data_teste)
-                
-                if not pos or 'longitude' not in pos:
-                    continue
-                
+            # Posições a cada 7 dias, com a casa de todas as amostras calculada de uma vez
+            longitudes, _ = self._grade_posicoes(planeta, data_inicio, periodo_dias, 7)
+            dias_amostra = np.arange(0, max(periodo_dias, 0), 7)
+            validas = ~np.isnan(longitudes)
+            dias_amostra = dias_amostra[validas]
+            
+            if len(dias_amostra):
                 # ✅ USAR CÚSPIDES REAIS em vez de divisão por 30°
-                casa_teste = self.determinar_casa_por_cuspides(pos['longitude'], cuspides)
+                casas = self.determinar_casas_por_cuspides(longitudes[validas], cuspides)
+                logger.debug("[v12.2] %s começa na Casa %s em %s", planeta, casas[0],
+                             _formatar_data(data_inicio + timedelta(days=int(dias_amostra[0]))))
+                
+                # Amostras em que o planeta mudou de casa
+                inicios = [0] + (np.flatnonzero(np.diff(casas)) + 1).tolist()
+                for inicio, proximo in zip(inicios, inicios[1:]):
+                    entrada_casa = data_inicio + timedelta(days=int(dias_amostra[inicio]))
+                    data_saida = data_inicio + timedelta(days=int(dias_amostra[proximo]))
+                    movimento_casas.append({
+                        'casa': int(casas[inicio]),
+                        'data_entrada': _formatar_data(entrada_casa),
+                        'data_saida': _formatar_data(data_saida),
+                        'duracao_dias': (data_saida - entrada_casa).days
+                    })
+                    logger.debug("[v12.2] %s mudou da Casa %s para Casa %s", planeta, casas[inicio], casas[proximo])
                 
-                if casa_atual is None:
-                    casa_atual = casa_teste
-                    entrada_casa = data_teste
-                    logger.debug(f"[v12.2] {planeta} começa na Casa {casa_atual} em {entrada_casa.strftime('%Y-%m-%d')}")
-                    
-                elif casa_teste != casa_atual:
-                    # Mudança de casa detectada
+                # Adicionar última casa (ou única casa se não houve mudança)
+                casa_atual = int(casas[inicios[-1]])
+                entrada_casa = data_inicio + timedelta(days=int(dias_amostra[inicios[-1]]))
+                if casa_atual:
                     movimento_casas.append({
                         'casa': casa_atual,
-                        'data_entrada': entrada_casa.strftime('%Y-%m-%d'),
-                        'data_saida': data_teste.strftime('%Y-%m-%d'),
-                        'duracao_dias': (data_teste - entrada_casa).days
+                        'data_entrada': _formatar_data(entrada_casa),
+                        'data_saida': _formatar_data(data_inicio + timedelta(days=periodo_dias)),
+                        'duracao_dias': periodo_dias - (entrada_casa - data_inicio).days
                     })
-                    
-                    logger.debug(f"[v12.2] {planeta} mudou da Casa {casa_atual} para Casa {casa_teste}")
-                    casa_atual = casa_teste
-                    entrada_casa = data_teste
-            
-            # Adicionar última casa (ou única casa se não houve mudança)
-            if casa_atual and entrada_casa:
-                movimento_casas.append({
-                    'casa': casa_atual,
-                    'data_entrada': entrada_casa.strftime('%Y-%m-%d'),
-                    'data_saida': (data_inicio + timedelta(days=periodo_dias)).strftime('%Y-%m-%d'),
-                    'duracao_dias': periodo_dias - (entrada_casa - data_inicio).days
-                })
             
-            logger.info(f"[v12.2] {planeta}: Total de {len(movimento_casas)} períodos em casas")
+            logger.info("[v12.2] %s: Total de %s períodos em casas", planeta, len(movimento_casas))
             return movimento_casas
             
         except Exception as e:
-            logger.error(f"[v12.2] Erro ao calcular movimento entre casas: {e}")
+            logger.error("[v12.2] Erro ao calcular movimento entre casas: %s", e)
             return []
     
     def calcular_casas_ativadas_transito_v2(self, planeta: str, signo: str, casas_natais: List[Dict], 
@@ -432,73 +623,68 @@ class TransitoAstrologicoPreciso:
         v12.2: Calcula casas ativadas usando cúspides reais
         """
         try:
-            # Usar cúspides do cache se não foram passadas
-            if not cuspides and self.cuspides_cache:
-                cuspides = self.cuspides_cache
-                
             casas_ativadas = []
-            casa_atual = None
-            data_entrada_casa = None
             
-            # Verificar casa por casa ao longo do período
-            for dias in range(0, (data_fim - data_inicio).days, 7):  # Semanal
-                data_teste = data_inicio + timedelta(days=dias)
-                
-                pos = self.calcular_posicao_planeta_swisseph(planeta, data_teste)
-                if not pos:
-                    pos = self.calcular_posicao_planeta_ephem(planeta, data_teste)
+            longitudes, _ = self._grade_posicoes(planeta, data_inicio, (data_fim - data_inicio).days)
+            
+            # Amostras semanais com posição disponível
+            dias_amostra = np.arange(0, (data_fim - data_inicio).days, 7)
+            dias_amostra = dias_amostra[~np.isnan(longitudes[dias_amostra])]
+            if len(dias_amostra) == 0:
+                return casas_ativadas
+            
+            # Casa de todas as amostras de uma vez
+            if cuspides:
+                # ✅ v12.2: Usar cúspides reais
+                casas = self.determinar_casas_por_cuspides(longitudes[dias_amostra], cuspides)
+            else:
+                casas = np.array([
+                    self.determinar_casa_natal_por_longitude(longitude, casas_natais)
+                    for longitude in longitudes[dias_amostra].tolist()
+                ])
+            
+            # Amostras em que o planeta mudou de casa
+            inicios = [0] + (np.flatnonzero(np.diff(casas)) + 1).tolist()
+            saidas = [data_inicio + timedelta(days=int(dias_amostra[i])) for i in inicios[1:]] + [data_fim]
+            
+            for inicio, data_saida in zip(inicios, saidas):
+                casa = int(casas[inicio])
+                if not casa:
+                    continue
                 
-                if pos:
-                    # ✅ v12.2: Usar cúspides reais
-                    if cuspides:
-                        casa_teste = self.determinar_casa_por_cuspides(pos['longitude'], cuspides)
-                    else:
-                        casa_teste = self.determinar_casa_natal_por_longitude(pos['longitude'], casas_natais)
-                    
-                    if casa_atual is None:
-                        casa_atual = casa_teste
-                        data_entrada_casa = data_teste
-                    elif casa_teste != casa_atual:
-                        # Mudança de casa
-                        if casa_atual and data_entrada_casa:
-                            casas_ativadas.append({
-                                'casa': casa_atual,
-                                'data_entrada': data_entrada_casa.strftime('%Y-%m-%d'),
-                                'data_saida': data_teste.strftime('%Y-%m-%d'),
-                                'duracao_dias': (data_teste - data_entrada_casa).days
-                            })
-                        
-                        casa_atual = casa_teste
-                        data_entrada_casa = data_teste
-            
-            # Adicionar última casa
-            if casa_atual and data_entrada_casa:
+                data_entrada_casa = data_inicio + timedelta(days=int(dias_amostra[inicio]))
                 casas_ativadas.append({
-                    'casa': casa_atual,
-                    'data_entrada': data_entrada_casa.strftime('%Y-%m-%d'),
-                    'data_saida': data_fim.strftime('%Y-%m-%d'),
-                    'duracao_dias': (data_fim - data_entrada_casa).days
+                    'casa': casa,
+                    'data_entrada': _formatar_data(data_entrada_casa),
+                    'data_saida': _formatar_data(data_saida),
+                    'duracao_dias': (data_saida - data_entrada_casa).days
                 })
             
             return casas_ativadas
             
         except Exception as e:
-            logger.error(f"[v12.2] Erro ao calcular casas ativadas: {e}")
+            logger.error("[v12.2] Erro ao calcular casas ativadas: %s", e)
             return []
     
     # ============================================================
     # FUNÇÕES ORIGINAIS - MANTIDAS PARA COMPATIBILIDADE
     # ============================================================
     
-    def calcular_posicao_planeta_swisseph(self, planeta: str, data: datetime) -> Dict:
+    def calcular_posicao_planeta(self, planeta: str, data: datetime) -> Optional[PosicaoPlaneta]:
+        """Posição pelo Swiss Ephemeris, com o PyEphem como alternativa"""
+        return self.calcular_posicao_planeta_swisseph(planeta, data) or self.calcular_posicao_planeta_ephem(planeta, data)
+    
+    def calcular_posicao_planeta_swisseph(self, planeta: str, data: datetime) -> Optional[PosicaoPlaneta]:
         """Calcula posição exata usando Swiss Ephemeris"""
         if not SWISSEPH_DISPONIVEL or planeta not in self.planetas_swe:
             return None
         
+        # Converter data para Julian Day
+        return self._posicao_swisseph_jd(planeta, swe.julday(data.year, data.month, data.day, data.hour + data.minute/60.0))
+    
+    def _posicao_swisseph_jd(self, planeta: str, jd: float) -> Optional[PosicaoPlaneta]:
+        """Posição pelo Swiss Ephemeris a partir do dia juliano (UT)"""
         try:
-            # Converter data para Julian Day
-            jd = swe.julday(data.year, data.month, data.day, data.hour + data.minute/60.0)
-            
             # Calcular posição
             resultado = swe.calc_ut(jd, self.planetas_swe[planeta])
             longitude = resultado[0][0]  # Longitude eclíptica
@@ -508,32 +694,38 @@ class TransitoAstrologicoPreciso:
             signo_index = int(longitude // 30)
             grau_no_signo = longitude % 30
             
-            return {
-                'longitude': longitude,
-                'signo': self.signos[signo_index],
-                'grau_no_signo': grau_no_signo,
-                'velocidade': velocidade,
-                'retrogrado': velocidade < 0
-            }
+            return PosicaoPlaneta(longitude, self.signos[signo_index], grau_no_signo, velocidade, velocidade < 0)
             
         except Exception as e:
-            logger.error(f"Erro SwissEph para {planeta}: {e}")
+            logger.error("Erro SwissEph para %s: %s", planeta, e)
             return None
     
-    def calcular_posicao_planeta_ephem(self, planeta: str, data: datetime) -> Dict:
+    def _corpo_ephem_thread(self, planeta: str):
+        """Instância do corpo PyEphem exclusiva da thread atual (compute() altera o objeto)"""
+        corpos = getattr(self._ephem_local, 'corpos', None)
+        if corpos is None:
+            corpos = {nome: type(corpo)() for nome, corpo in self.planetas_ephem.items()}
+            self._ephem_local.corpos = corpos
+        return corpos[planeta]
+    
+    def calcular_posicao_planeta_ephem(self, planeta: str, data: datetime) -> Optional[PosicaoPlaneta]:
         """Calcula posição usando PyEphem"""
         if not PYEPHEM_DISPONIVEL or planeta not in self.planetas_ephem:
             return None
         
+        # Data convertida direto do datetime (sem Observer nem formatação de string)
+        return self._posicao_ephem_data(planeta, ephem.Date(data))
+    
+    def _posicao_ephem_data(self, planeta: str, data_ephem: float) -> Optional[PosicaoPlaneta]:
+        """Posição pelo PyEphem a partir da data numérica do PyEphem (dia juliano de Dublin)"""
         try:
-            obj_planeta = self.planetas_ephem[planeta]
-            observer = ephem.Observer()
-            observer.date = data.strftime('%Y/%m/%d %H:%M:%S')
+            obj_planeta = self._corpo_ephem_thread(planeta)
             
-            obj_planeta.compute(observer)
+            # hlong é heliocêntrica e não depende da localização do observador
+            obj_planeta.compute(data_ephem)
             
-            # Longitude eclíptica
-            longitude = float(obj_planeta.hlong) * 180 / 3.14159
+            # Longitude eclíptica (radianos -> graus)
+            longitude = math.degrees(obj_planeta.hlong)
             if longitude < 0:
                 longitude += 360
             
@@ -541,15 +733,11 @@ class TransitoAstrologicoPreciso:
             signo_index = int(longitude // 30)
             grau_no_signo = longitude % 30
             
-            return {
-                'longitude': longitude,
-                'signo': self.signos[signo_index],
-                'grau_no_signo': grau_no_signo,
-                'velocidade': 0  # PyEphem não fornece velocidade diretamente
-            }
+            # PyEphem não fornece velocidade diretamente
+            return PosicaoPlaneta(longitude, self.signos[signo_index], grau_no_signo, 0, False)
             
         except Exception as e:
-            logger.error(f"Erro PyEphem para {planeta}: {e}")
+            logger.error("Erro PyEphem para %s: %s", planeta, e)
             return None
     
     def calcular_entrada_signo_precisa(self, planeta: str, signo_atual: str, data_ref: datetime = None) -> str:
@@ -561,45 +749,31 @@ class TransitoAstrologicoPreciso:
             # Normalizar signo
             signo_normalizado = self.signos_normalizados.get(signo_atual, signo_atual)
             
-            # Usar dados calibrados do cliente quando disponíveis
-            if planeta in self.calibracao_cliente:
-                cal = self.calibracao_cliente[planeta]
-                
-                # Saturno em Áries
-                if planeta == 'Saturno' and signo_normalizado == 'Áries':
-                    return cal['entrada_aries'].strftime('%Y-%m-%d')
-                
-                # Urano em Gêmeos
-                if planeta == 'Urano' and signo_normalizado == 'Gêmeos':
-                    return cal['entrada_gemeos'].strftime('%Y-%m-%d')
+            # Usar dados calibrados do cliente quando disponíveis (Saturno em Áries, Urano em Gêmeos)
+            entrada_calibrada = self.entradas_calibradas.get((planeta, signo_normalizado))
+            if entrada_calibrada is not None:
+                return entrada_calibrada
             
-            logger.debug(f"Calculando entrada de {planeta} no signo {signo_normalizado} a partir de {data_ref}")
+            logger.debug("Calculando entrada de %s no signo %s a partir de %s", planeta, signo_normalizado, data_ref)
             
-            # Buscar para trás até encontrar mudança de signo
-            for dias_atras in range(1, 1000):  # Buscar até ~3 anos
+            # Buscar para trás até encontrar mudança de signo (até ~3 anos)
+            dias_atras = self._primeiro_dia_fora_do_signo(planeta, signo_normalizado, data_ref, -1, 1000)
+            if dias_atras is not None:
                 data_teste = data_ref - timedelta(days=dias_atras)
                 
-                # Tentar Swiss Ephemeris primeiro
-                pos = self.calcular_posicao_planeta_swisseph(planeta, data_teste)
-                if not pos:
-                    pos = self.calcular_posicao_planeta_ephem(planeta, data_teste)
-                
-                if pos:
-                    pos_signo_normalizado = self.signos_normalizados.get(pos['signo'], pos['signo'])
-                    if pos_signo_normalizado != signo_normalizado:
-                        # Encontrou mudança - refinar a data
-                        data_entrada = self.refinar_data_mudanca_signo(planeta, data_teste, data_teste + timedelta(days=1))
-                        logger.debug(f"{planeta} entrou em {signo_normalizado} em {data_entrada}")
-                        return data_entrada
+                # Encontrou mudança - refinar a data
+                data_entrada = self.refinar_data_mudanca_signo(planeta, data_teste, data_teste + timedelta(days=1))
+                logger.debug("%s entrou em %s em %s", planeta, signo_normalizado, data_entrada)
+                return data_entrada
             
             # Se não encontrou, retornar estimativa
-            estimativa = (data_ref - timedelta(days=30)).strftime('%Y-%m-%d')
-            logger.warning(f"Entrada de {planeta} em {signo_normalizado} não encontrada, usando estimativa: {estimativa}")
+            estimativa = _formatar_data(data_ref - timedelta(days=30))
+            logger.warning("Entrada de %s em %s não encontrada, usando estimativa: %s", planeta, signo_normalizado, estimativa)
             return estimativa
             
         except Exception as e:
-            logger.error(f"Erro ao calcular entrada precisa: {e}")
-            return (self.data_referencia - timedelta(days=30)).strftime('%Y-%m-%d')
+            logger.error("Erro ao calcular entrada precisa: %s", e)
+            return _formatar_data(self.data_referencia - timedelta(days=30))
     
     def calcular_saida_signo_precisa(self, planeta: str, signo_atual: str, data_ref: datetime = None) -> str:
         """Calcula saída do signo considerando retrogradação"""
@@ -622,165 +796,207 @@ class TransitoAstrologicoPreciso:
             if data_ref is None:
                 data_ref = self.data_referencia
             
-            logger.debug(f"Calculando saída de {planeta} do signo {signo_atual} a partir de {data_ref}")
+            logger.debug("Calculando saída de %s do signo %s a partir de %s", planeta, signo_atual, data_ref)
             
-            # Primeiro, verificar se há retrogradação próxima
-            retrogradacoes = self.detectar_retrogradacao_precisa_v2(planeta, data_ref, self.cuspides_cache)
+            # Primeiro, verificar se há retrogradação próxima (só a data de início é usada,
+            # as cúspides não influem)
+            retrogradacoes = self.detectar_retrogradacao_precisa_v2(planeta, data_ref)
             
             if retrogradacoes:
                 # Se há retrogradação, a "saída" é quando inicia a retrogradação
                 data_inicio_retro = retrogradacoes[0]['data_inicio']
-                logger.debug(f"{planeta} iniciará retrogradação em {data_inicio_retro}, considerando como saída do signo")
+                logger.debug("%s iniciará retrogradação em %s, considerando como saída do signo", planeta, data_inicio_retro)
                 return data_inicio_retro
             
             # Se não há retrogradação, calcular saída normal
-            for dias_futuros in range(1, limite_dias):
+            dias_futuros = self._primeiro_dia_fora_do_signo(planeta, signo_atual, data_ref, 1, limite_dias)
+            if dias_futuros is not None:
                 data_teste = data_ref + timedelta(days=dias_futuros)
                 
-                # Tentar Swiss Ephemeris primeiro
-                pos = self.calcular_posicao_planeta_swisseph(planeta, data_teste)
-                if not pos:
-                    pos = self.calcular_posicao_planeta_ephem(planeta, data_teste)
-                
-                if pos and pos['signo'] != signo_atual:
-                    # Encontrou mudança - refinar a data
-                    data_saida = self.refinar_data_mudanca_signo(planeta, data_teste - timedelta(days=1), data_teste)
-                    logger.debug(f"{planeta} sairá de {signo_atual} em {data_saida}")
-                    return data_saida
+                # Encontrou mudança - refinar a data
+                data_saida = self.refinar_data_mudanca_signo(planeta, data_teste - timedelta(days=1), data_teste)
+                logger.debug("%s sairá de %s em %s", planeta, signo_atual, data_saida)
+                return data_saida
             
             # Se não encontrou, estimar baseado no período máximo
-            estimativa = (data_ref + timedelta(days=limite_dias)).strftime('%Y-%m-%d')
-            logger.warning(f"Saída de {planeta} de {signo_atual} não encontrada, usando estimativa: {estimativa}")
+            estimativa = _formatar_data(data_ref + timedelta(days=limite_dias))
+            logger.warning("Saída de %s de %s não encontrada, usando estimativa: %s", planeta, signo_atual, estimativa)
             return estimativa
             
         except Exception as e:
-            logger.error(f"Erro ao calcular saída precisa: {e}")
-            return (self.data_referencia + timedelta(days=limite_dias)).strftime('%Y-%m-%d')
+            logger.error("Erro ao calcular saída precisa: %s", e)
+            return _formatar_data(self.data_referencia + timedelta(days=limite_dias))
+    
+    def _primeiro_dia_fora_do_signo(self, planeta: str, signo: str, data_ref: datetime, sentido: int, limite_dias: int) -> Optional[int]:
+        """
+        Primeiro dia (1 <= dias < limite_dias, contado a partir de data_ref no sentido dado) em que
+        o planeta não está em signo, ou None. Com a posição do Swiss Ephemeris, os dias em que a
+        velocidade máxima não permite alcançar a borda do signo são pulados; o resultado é o mesmo
+        da varredura dia a dia
+        """
+        # Datas numéricas (dia juliano / data do PyEphem) + deslocamento em dias
+        jd_ref = None
+        if SWISSEPH_DISPONIVEL and planeta in self.planetas_swe:
+            jd_ref = swe.julday(data_ref.year, data_ref.month, data_ref.day, data_ref.hour + data_ref.minute/60.0)
+        data_ephem_ref = None
+        if PYEPHEM_DISPONIVEL and planeta in self.planetas_ephem:
+            data_ephem_ref = float(ephem.Date(data_ref))
+        
+        dias = 1
+        while dias < limite_dias:
+            passo = 1
+            
+            # Tentar Swiss Ephemeris primeiro
+            pos = self._posicao_swisseph_jd(planeta, jd_ref + sentido * dias) if jd_ref is not None else None
+            if pos:
+                if pos.signo == signo:
+                    passo = self._passo_seguro_no_signo(planeta, pos.longitude)
+            elif data_ephem_ref is not None:
+                pos = self._posicao_ephem_data(planeta, data_ephem_ref + sentido * dias)
+            
+            if pos and pos.signo != signo:
+                return dias
+            
+            dias += passo
+        
+        return None
     
     def refinar_data_mudanca_signo(self, planeta: str, data_antes: datetime, data_depois: datetime) -> str:
         """Refina a data exata de mudança de signo"""
         try:
+            # Signo antes da mudança: data_antes só avança para datas no mesmo signo,
+            # então basta consultá-lo uma vez
+            pos_antes = self.calcular_posicao_planeta(planeta, data_antes)
+            
             # Busca binária para encontrar momento exato
             while (data_depois - data_antes).days > 0:
                 data_meio = data_antes + (data_depois - data_antes) / 2
                 
-                pos = self.calcular_posicao_planeta_swisseph(planeta, data_meio)
-                if not pos:
-                    pos = self.calcular_posicao_planeta_ephem(planeta, data_meio)
+                pos = self.calcular_posicao_planeta(planeta, data_meio)
                 
                 if not pos:
                     break
                 
                 # Verificar se já mudou de signo
-                pos_antes = self.calcular_posicao_planeta_swisseph(planeta, data_antes)
-                if not pos_antes:
-                    pos_antes = self.calcular_posicao_planeta_ephem(planeta, data_antes)
-                
-                if pos and pos_antes and pos['signo'] == pos_antes['signo']:
+                if pos and pos_antes and pos.signo == pos_antes.signo:
                     data_antes = data_meio
                 else:
                     data_depois = data_meio
             
-            return data_depois.strftime('%Y-%m-%d')
+            return _formatar_data(data_depois)
             
         except Exception as e:
-            logger.error(f"Erro ao refinar data: {e}")
-            return data_depois.strftime('%Y-%m-%d')
+            logger.error("Erro ao refinar data: %s", e)
+            return _formatar_data(data_depois)
+    
+    def _preparar_natais(self, natais: List[Dict]):
+        """Extrai nomes, longitudes e casas dos planetas natais uma única vez (cache por lista)"""
+        cache = self._natais_preparados
+        if cache is not None and cache[0] is natais:
+            return cache[1]
+        
+        validos = [natal for natal in natais if isinstance(natal, dict) and 'name' in natal]
+        preparados = (
+            [natal.get('name') for natal in validos],
+            np.array([float(natal.get('fullDegree', 0)) for natal in validos], dtype=np.float64),
+            [natal.get('house', 1) for natal in validos]
+        )
+        
+        self._natais_preparados = (natais, preparados)
+        return preparados
     
-    def calcular_aspectos_precisos(self, planeta_transito: Dict, natais: List[Dict]) -> List[Dict]:
-        """Calcula aspectos com orbes astronômicos corretos"""
+    def calcular_aspectos_precisos(self, planeta_transito: Dict, natais: List[Dict], limite: Optional[int] = None) -> List[Dict]:
+        """Calcula aspectos com orbes astronômicos corretos (apenas os `limite` de menor orbe, se informado)"""
         try:
-            aspectos = []
-            
             grau_transito = float(planeta_transito.get('fullDegree', 0))
+            nomes_natais, graus_natais, casas_natais = self._preparar_natais(natais)
             
-            for natal in natais:
-                if not isinstance(natal, dict) or 'name' not in natal:
-                    continue
-                
-                grau_natal = float(natal.get('fullDegree', 0))
-                
-                # Calcular diferença angular
-                diferenca = abs(grau_transito - grau_natal)
-                diferenca = min(diferenca, 360 - diferenca)
-                
-                # Verificar aspectos com orbes corretos
-                for angulo, nome_aspecto, orbe_max in self.aspectos:
-                    orbe = abs(diferenca - angulo)
-                    if orbe <= orbe_max:
-                        aspectos.append({
-                            'tipo_aspecto': nome_aspecto,
-                            'planeta_natal': natal.get('name'),
-                            'casa_natal': int(natal.get('house', 1)),
-                            'orbe': round(orbe, 2),
-                            'orbe_maximo': orbe_max,
-                            'exatidao': round((1 - orbe/orbe_max) * 100, 1)  # Percentual de exatidão
-                        })
-                        break
-            
-            # Ordenar por exatidão
-            aspectos.sort(key=lambda x: x['orbe'])
-            return aspectos
+            return self._aspectos_em_orbe(grau_transito, nomes_natais, graus_natais, [int(casa) for casa in casas_natais], limite)
             
         except Exception as e:
-            logger.error(f"Erro ao calcular aspectos precisos: {e}")
+            logger.error("Erro ao calcular aspectos precisos: %s", e)
             return []
     
-    def calcular_duracao_aspectos(self, planeta_transito: Dict, natais: List[Dict], data_ref: datetime = None) -> List[Dict]:
-        """Calcula duração temporal dos aspectos"""
+    def _aspectos_em_orbe(self, grau_transito: float, nomes_natais: List[str], graus_natais: np.ndarray, casas_natais: List,
+                          limite: Optional[int] = None) -> List[Dict]:
+        """Aspectos maiores entre um grau em trânsito e os natais, ordenados por orbe (vale o primeiro aspecto em orbe)"""
+        aspectos = []
+        
+        # Calcular diferença angular para todos os natais de uma vez
+        diferencas = np.abs(grau_transito - graus_natais)
+        diferencas = np.minimum(diferencas, 360 - diferencas)
+        
+        # Orbe de cada natal contra cada aspecto (natais x aspectos)
+        orbes = np.abs(diferencas[:, None] - self._angulos_aspectos[None, :])
+        em_orbe = orbes <= self._orbes_aspectos[None, :]
+        indices_aspecto = em_orbe.argmax(axis=1)
+        
+        for i in np.flatnonzero(em_orbe.any(axis=1)).tolist():
+            indice = int(indices_aspecto[i])
+            _, nome_aspecto, orbe_max = self.aspectos[indice]
+            orbe = float(orbes[i, indice])
+            aspectos.append({
+                'tipo_aspecto': nome_aspecto,
+                'planeta_natal': nomes_natais[i],
+                'casa_natal': casas_natais[i],
+                'orbe': round(orbe, 2),
+                'orbe_maximo': orbe_max,
+                'exatidao': round((1 - orbe/orbe_max) * 100, 1)  # Percentual de exatidão
+            })
+        
+        # Ordenar por exatidão (seleção parcial quando só os primeiros interessam)
+        if limite is not None:
+            return heapq.nsmallest(limite, aspectos, key=itemgetter('orbe'))
+        aspectos.sort(key=itemgetter('orbe'))
+        return aspectos
+    
+    def calcular_duracao_aspectos(self, planeta_transito: Dict, natais: List[Dict], data_ref: datetime = None,
+                                  limite: Optional[int] = None) -> List[Dict]:
+        """Calcula duração temporal dos aspectos (apenas os `limite` mais longos, se informado)"""
         try:
             aspectos_com_duracao = []
             if data_ref is None:
                 data_ref = self.data_referencia
             
             nome_planeta = planeta_transito.get('name', 'Desconhecido')
+            nomes_natais, graus_natais, casas_natais = self._preparar_natais(natais)
+            
+            # Posições da janela (30 dias antes até 60 dias depois) calculadas uma única vez
+            data_inicio_janela = data_ref - timedelta(days=30)
+            longitudes, _ = self._grade_posicoes(nome_planeta, data_inicio_janela, 90)
+            dias_validos = np.flatnonzero(~np.isnan(longitudes))
+            
+            # Orbes de todas as amostras contra todos os natais e aspectos (dias x natais x aspectos)
+            diferencas = np.abs(longitudes[dias_validos][:, None] - graus_natais[None, :])
+            diferencas = np.minimum(diferencas, 360 - diferencas)
+            em_orbe = np.abs(diferencas[:, :, None] - self._angulos_aspectos[None, None, :]) <= self._orbes_aspectos[None, None, :]
+            
+            # Primeira e última amostra em orbe de cada par (natal, aspecto)
+            primeiras = em_orbe.argmax(axis=0)
+            ultimas = len(dias_validos) - 1 - em_orbe[::-1].argmax(axis=0)
+            
+            for indice_natal, indice_aspecto in np.argwhere(em_orbe.any(axis=0)).tolist():
+                _, nome_aspecto, orbe_max = self.aspectos[indice_aspecto]
+                data_inicio = data_inicio_janela + timedelta(days=int(dias_validos[primeiras[indice_natal, indice_aspecto]]))
+                data_fim = data_inicio_janela + timedelta(days=int(dias_validos[ultimas[indice_natal, indice_aspecto]]))
+                
+                if (data_fim - data_inicio).days > 0:
+                    aspectos_com_duracao.append({
+                        'tipo_aspecto': nome_aspecto,
+                        'planeta_natal': nomes_natais[indice_natal],
+                        'casa_natal': int(casas_natais[indice_natal]),
+                        'data_inicio': _formatar_data(data_inicio),
+                        'data_fim': _formatar_data(data_fim),
+                        'duracao_dias': (data_fim - data_inicio).days,
+                        'orbe_maximo': orbe_max
+                    })
             
-            for natal in natais:
-                if not isinstance(natal, dict) or 'name' not in natal:
-                    continue
-                
-                grau_natal = float(natal.get('fullDegree', 0))
-                
-                # Para cada tipo de aspecto
-                for angulo, nome_aspecto, orbe_max in self.aspectos:
-                    
-                    # Buscar quando aspecto entra em orbe
-                    data_inicio = None
-                    data_fim = None
-                    
-                    for dias in range(-30, 60):  # 30 dias antes até 60 dias depois
-                        data_teste = data_ref + timedelta(days=dias)
-                        
-                        pos = self.calcular_posicao_planeta_swisseph(nome_planeta, data_teste)
-                        if not pos:
-                            pos = self.calcular_posicao_planeta_ephem(nome_planeta, data_teste)
-                        
-                        if pos:
-                            grau_transito = pos.get('longitude', 0)
-                            diferenca = abs(grau_transito - grau_natal)
-                            diferenca = min(diferenca, 360 - diferenca)
-                            orbe_atual = abs(diferenca - angulo)
-                            
-                            if orbe_atual <= orbe_max:  # Dentro do orbe
-                                if data_inicio is None:
-                                    data_inicio = data_teste
-                                data_fim = data_teste
-                    
-                    if data_inicio and data_fim and (data_fim - data_inicio).days > 0:
-                        aspectos_com_duracao.append({
-                            'tipo_aspecto': nome_aspecto,
-                            'planeta_natal': natal.get('name'),
-                            'casa_natal': int(natal.get('house', 1)),
-                            'data_inicio': data_inicio.strftime('%Y-%m-%d'),
-                            'data_fim': data_fim.strftime('%Y-%m-%d'),
-                            'duracao_dias': (data_fim - data_inicio).days,
-                            'orbe_maximo': orbe_max
-                        })
-            
-            return sorted(aspectos_com_duracao, key=lambda x: x['duracao_dias'], reverse=True)
+            if limite is not None:
+                return heapq.nlargest(limite, aspectos_com_duracao, key=itemgetter('duracao_dias'))
+            return sorted(aspectos_com_duracao, key=itemgetter('duracao_dias'), reverse=True)
             
         except Exception as e:
-            logger.error(f"Erro ao calcular duração dos aspectos: {e}")
+            logger.error("Erro ao calcular duração dos aspectos: %s", e)
             return []
     
     def validar_calculo_com_fonte_externa(self, planeta: str, data: datetime) -> bool:
@@ -794,26 +1010,31 @@ class TransitoAstrologicoPreciso:
             
             if pos_swe and pos_ephem:
                 # Comparar posições calculadas por diferentes bibliotecas
-                diff_longitude = abs(pos_swe['longitude'] - pos_ephem['longitude'])
+                diff_longitude = abs(pos_swe.longitude - pos_ephem.longitude)
                 
                 # Tolerância de 1 grau para diferenças entre bibliotecas
                 if diff_longitude > 1 and diff_longitude < 359:
-                    logger.warning(f"Diferença significativa entre bibliotecas para {planeta} em {data}: {diff_longitude}°")
+                    logger.warning("Diferença significativa entre bibliotecas para %s em %s: %s°", planeta, data, diff_longitude)
                     return False
                 
-                logger.debug(f"Validação OK para {planeta} em {data}: diferença {diff_longitude}°")
+                logger.debug("Validação OK para %s em %s: diferença %s°", planeta, data, diff_longitude)
                 return True
             
             # Se apenas uma biblioteca disponível, considerar válido
             return pos_swe is not None or pos_ephem is not None
             
         except Exception as e:
-            logger.error(f"Erro na validação: {e}")
+            logger.error("Erro na validação: %s", e)
             return False
     
-    def calcular_transito_especifico(self, planeta: Dict, natais: List[Dict], casas_natais: List[Dict]) -> Dict:
+    def calcular_transito_especifico(self, planeta: Dict, natais: List[Dict], casas_natais: List[Dict],
+                                     cuspides: List[Dict] = None) -> Dict:
         """Calcula trânsito específico para resposta estruturada da LLM"""
         try:
+            # Usar cúspides do cache se não foram passadas
+            if cuspides is None:
+                cuspides = casas_natais or self.cuspides_cache
+            
             nome = planeta.get('name', 'Desconhecido')
             signo = planeta.get('sign', 'Áries')
             grau_atual = float(planeta.get('normDegree', 0))
@@ -833,14 +1054,14 @@ class TransitoAstrologicoPreciso:
                 'grau_atual': round(grau_atual, 2),
                 'longitude_atual': round(longitude_atual, 2),
                 'periodo_analise': {
-                    'inicio': data_inicio.strftime('%Y-%m-%d'),
-                    'fim': data_fim.strftime('%Y-%m-%d')
+                    'inicio': _formatar_data(data_inicio),
+                    'fim': _formatar_data(data_fim)
                 }
             }
             
             # 1. CASAS ATIVADAS (baseado nas casas natais)
             # v12.2: Usar função corrigida
-            casas_ativadas = self.calcular_casas_ativadas_transito_v2(nome, signo, casas_natais, data_inicio, data_fim, casas_natais)
+            casas_ativadas = self.calcular_casas_ativadas_transito_v2(nome, signo, casas_natais, data_inicio, data_fim, cuspides)
             resultado['casas_ativadas'] = casas_ativadas
             
             # 2. RETROGRADAÇÕES para signo anterior
@@ -864,12 +1085,62 @@ class TransitoAstrologicoPreciso:
             return resultado
             
         except Exception as e:
-            logger.error(f"Erro ao calcular trânsito específico de {planeta.get('name', 'Desconhecido')}: {e}")
+            logger.error("Erro ao calcular trânsito específico de %s: %s", planeta.get('name', 'Desconhecido'), e)
             return {
                 'planeta': planeta.get('name', 'Desconhecido'),
                 'erro': str(e)
             }
     
+    def _grade_posicoes(self, planeta: str, data_inicio: datetime, dias: int, passo: int = 1):
+        """
+        Longitudes e velocidades do planeta a cada `passo` dias (diárias por padrão) durante `dias`
+        a partir de data_inicio (NaN onde não há posição)
+        """
+        amostras = range(0, max(dias, 0), passo)
+        longitudes = velocidades = None
+        
+        # Datas numéricas (dia juliano / data do PyEphem) + deslocamento em dias,
+        # sem montar um datetime nem convertê-lo a cada amostra
+        jd_inicio = None
+        if SWISSEPH_DISPONIVEL and planeta in self.planetas_swe:
+            jd_inicio = swe.julday(data_inicio.year, data_inicio.month, data_inicio.day,
+                                   data_inicio.hour + data_inicio.minute/60.0)
+        data_ephem_inicio = None
+        if PYEPHEM_DISPONIVEL and planeta in self.planetas_ephem:
+            data_ephem_inicio = float(ephem.Date(data_inicio))
+        
+        # Caminho rápido: todas as amostras direto do Swiss Ephemeris num único laço, sem montar
+        # PosicaoPlaneta por dia; qualquer falha cai na grade amostra a amostra abaixo
+        if jd_inicio is not None and len(amostras):
+            calc_ut = swe.calc_ut
+            id_swe = self.planetas_swe[planeta]
+            try:
+                resultados = np.array([calc_ut(jd_inicio + dia, id_swe)[0] for dia in amostras])
+                if np.all(resultados[:, 0] < 360):
+                    longitudes, velocidades = resultados[:, 0].copy(), resultados[:, 3].copy()
+            except Exception as e:
+                logger.debug("Grade SwissEph de %s amostra a amostra: %s", planeta, e)
+        
+        if longitudes is None:
+            longitudes = np.full(len(amostras), np.nan)
+            velocidades = np.full(len(amostras), np.nan)
+            
+            for indice, dia in enumerate(amostras):
+                pos = None
+                if jd_inicio is not None:
+                    pos = self._posicao_swisseph_jd(planeta, jd_inicio + dia)
+                if not pos and data_ephem_inicio is not None:
+                    pos = self._posicao_ephem_data(planeta, data_ephem_inicio + dia)
+                
+                if pos:
+                    longitudes[indice] = pos.longitude
+                    velocidades[indice] = pos.velocidade
+        
+        # Arrays compartilhados pelo cache: somente leitura
+        longitudes.setflags(write=False)
+        velocidades.setflags(write=False)
+        return longitudes, velocidades
+    
     def detectar_retrogradacao_signo_anterior(self, planeta: str, signo_atual: str, data_inicio: datetime, data_fim: datetime) -> Dict:
         """Detecta retrogradação que leva o planeta ao signo anterior"""
         try:
@@ -880,34 +1151,35 @@ class TransitoAstrologicoPreciso:
             signo_normalizado = self.signos_normalizados.get(signo_atual, signo_atual)
             
             # Índice do signo atual
-            indice_signo_atual = self.signos.index(signo_normalizado)
+            indice_signo_atual = self._signo_idx.get(signo_normalizado)
+            if indice_signo_atual is None:
+                logger.warning("Signo desconhecido: %s", signo_atual)
+                return None
             signo_anterior = self.signos[indice_signo_atual - 1]
             
-            for dias in range(0, (data_fim - data_inicio).days):
-                data_teste = data_inicio + timedelta(days=dias)
-                
-                pos = self.calcular_posicao_planeta_swisseph(planeta, data_teste)
-                if not pos:
-                    pos = self.calcular_posicao_planeta_ephem(planeta, data_teste)
-                
-                if pos:
-                    # Verificar se retrogradou para signo anterior
-                    if pos['signo'] == signo_anterior and pos.get('velocidade', 0) < 0:
-                        # Encontrar período completo da retrogradação
-                        data_inicio_retro = self.refinar_inicio_retrogradacao(planeta, data_teste)
-                        data_fim_retro = self.refinar_fim_retrogradacao(planeta, data_teste)
-                        
-                        return {
-                            'signo_destino': signo_anterior,
-                            'data_inicio': data_inicio_retro,
-                            'data_fim': data_fim_retro,
-                            'duracao_dias': (datetime.strptime(data_fim_retro, '%Y-%m-%d') - datetime.strptime(data_inicio_retro, '%Y-%m-%d')).days
-                        }
+            longitudes, velocidades = self._grade_posicoes(planeta, data_inicio, (data_fim - data_inicio).days)
             
-            return None
+            # Primeiro dia em que retrogradou para o signo anterior
+            no_signo_anterior = longitudes // 30 == (indice_signo_atual - 1) % 12
+            dias_retro = np.flatnonzero(no_signo_anterior & (velocidades < 0))
+            if len(dias_retro) == 0:
+                return None
+            
+            data_teste = data_inicio + timedelta(days=int(dias_retro[0]))
+            
+            # Encontrar período completo da retrogradação
+            data_inicio_retro = self.refinar_inicio_retrogradacao(planeta, data_teste)
+            data_fim_retro = self.refinar_fim_retrogradacao(planeta, data_teste)
+            
+            return {
+                'signo_destino': signo_anterior,
+                'data_inicio': data_inicio_retro,
+                'data_fim': data_fim_retro,
+                'duracao_dias': (datetime.strptime(data_fim_retro, '%Y-%m-%d') - datetime.strptime(data_inicio_retro, '%Y-%m-%d')).days
+            }
             
         except Exception as e:
-            logger.error(f"Erro ao detectar retrogradação: {e}")
+            logger.error("Erro ao detectar retrogradação: %s", e)
             return None
     
     def calcular_aspectos_anuais_precisos(self, planeta_transito: Dict, natais: List[Dict], data_inicio: datetime, data_fim: datetime) -> List[Dict]:
@@ -915,90 +1187,75 @@ class TransitoAstrologicoPreciso:
         try:
             aspectos_anuais = []
             nome_planeta = planeta_transito.get('name', 'Desconhecido')
+            nomes_natais, graus_natais, casas_natais = self._preparar_natais(natais)
             
-            for natal in natais:
-                if not isinstance(natal, dict) or 'name' not in natal:
-                    continue
-                
-                planeta_natal = natal.get('name')
-                grau_natal = float(natal.get('fullDegree', 0))
-                casa_natal = int(natal.get('house', 1))
-                
-                # Para cada aspecto maior
-                for angulo, nome_aspecto, orbe_max in self.aspectos:
-                    periodos_ativos = self.calcular_periodos_aspecto_ativo(
-                        nome_planeta, grau_natal, angulo, orbe_max, data_inicio, data_fim
-                    )
-                    
-                    if periodos_ativos:
-                        aspectos_anuais.append({
-                            'tipo_aspecto': nome_aspecto,
-                            'planeta_natal': planeta_natal,
-                            'casa_natal': casa_natal,
-                            'grau_natal': round(grau_natal, 2),
-                            'orbe_maximo': orbe_max,
-                            'periodos_ativos': periodos_ativos
-                        })
+            longitudes, _ = self._grade_posicoes(nome_planeta, data_inicio, (data_fim - data_inicio).days)
             
-            return sorted(aspectos_anuais, key=lambda x: x['periodos_ativos'][0]['data_inicio'] if x['periodos_ativos'] else '9999-99-99')
+            # Dias sem posição não alteram o estado do aspecto
+            dias_validos = np.flatnonzero(~np.isnan(longitudes))
             
-        except Exception as e:
-            logger.error(f"Erro ao calcular aspectos anuais: {e}")
-            return []
-    
-    def calcular_periodos_aspecto_ativo(self, planeta: str, grau_natal: float, angulo_aspecto: float, orbe_max: float, data_inicio: datetime, data_fim: datetime) -> List[Dict]:
-        """Calcula períodos em que um aspecto está ativo"""
-        try:
-            periodos = []
-            em_aspecto = False
-            inicio_periodo = None
+            # Orbes de todos os dias contra todos os natais e aspectos (dias x natais x aspectos)
+            diferencas = np.abs(longitudes[dias_validos][:, None] - graus_natais[None, :])
+            diferencas = np.minimum(diferencas, 360 - diferencas)
+            orbes = np.abs(diferencas[:, :, None] - self._angulos_aspectos[None, None, :])
+            em_orbe = orbes <= self._orbes_aspectos[None, None, :]
             
-            for dias in range(0, (data_fim - data_inicio).days):
-                data_teste = data_inicio + timedelta(days=dias)
-                
-                pos = self.calcular_posicao_planeta_swisseph(planeta, data_teste)
-                if not pos:
-                    pos = self.calcular_posicao_planeta_ephem(planeta, data_teste)
+            # Percorrer apenas os pares (natal, aspecto) que entram em orbe em algum dia
+            for indice_natal, indice_aspecto in np.argwhere(em_orbe.any(axis=0)).tolist():
+                _, nome_aspecto, orbe_max = self.aspectos[indice_aspecto]
+                periodos_ativos = self._periodos_em_orbe(
+                    orbes[:, indice_natal, indice_aspecto], em_orbe[:, indice_natal, indice_aspecto],
+                    dias_validos, orbe_max, data_inicio, data_fim
+                )
                 
-                if pos:
-                    grau_transito = pos['longitude']
-                    
-                    # Calcular diferença angular
-                    diferenca = abs(grau_transito - grau_natal)
-                    diferenca = min(diferenca, 360 - diferenca)
-                    
-                    # Verificar se está no orbe do aspecto
-                    orbe_atual = abs(diferenca - angulo_aspecto)
-                    
-                    if orbe_atual <= orbe_max:  # Dentro do orbe
-                        if not em_aspecto:
-                            inicio_periodo = data_teste
-                            em_aspecto = True
-                    else:  # Fora do orbe
-                        if em_aspecto:
-                            periodos.append({
-                                'data_inicio': inicio_periodo.strftime('%Y-%m-%d'),
-                                'data_fim': data_teste.strftime('%Y-%m-%d'),
-                                'duracao_dias': (data_teste - inicio_periodo).days,
-                                'orbe_maximo_atingido': round(orbe_atual, 2)
-                            })
-                            em_aspecto = False
-            
-            # Finalizar último período se ainda ativo
-            if em_aspecto and inicio_periodo:
-                periodos.append({
-                    'data_inicio': inicio_periodo.strftime('%Y-%m-%d'),
-                    'data_fim': data_fim.strftime('%Y-%m-%d'),
-                    'duracao_dias': (data_fim - inicio_periodo).days,
-                    'orbe_maximo_atingido': orbe_max
+                grau_natal = float(graus_natais[indice_natal])
+                aspectos_anuais.append({
+                    'tipo_aspecto': nome_aspecto,
+                    'planeta_natal': nomes_natais[indice_natal],
+                    'casa_natal': int(casas_natais[indice_natal]),
+                    'grau_natal': round(grau_natal, 2),
+                    'orbe_maximo': orbe_max,
+                    'periodos_ativos': periodos_ativos
                 })
             
-            return periodos
+            return sorted(aspectos_anuais, key=lambda x: x['periodos_ativos'][0]['data_inicio'] if x['periodos_ativos'] else '9999-99-99')
             
         except Exception as e:
-            logger.error(f"Erro ao calcular períodos de aspecto: {e}")
+            logger.error("Erro ao calcular aspectos anuais: %s", e)
             return []
     
+    def _periodos_em_orbe(self, orbes: np.ndarray, em_orbe: np.ndarray, dias_validos: np.ndarray,
+                          orbe_max: float, data_inicio: datetime, data_fim: datetime) -> List[Dict]:
+        """Converte a série diária de orbes de um aspecto em períodos ativos"""
+        periodos = []
+        
+        # Entradas e saídas do orbe
+        antes_em_orbe = np.concatenate(([False], em_orbe[:-1]))
+        entradas = np.flatnonzero(em_orbe & ~antes_em_orbe).tolist()
+        saidas = np.flatnonzero(~em_orbe & antes_em_orbe).tolist()
+        
+        for entrada, saida in zip(entradas, saidas):
+            inicio_periodo = data_inicio + timedelta(days=int(dias_validos[entrada]))
+            data_saida = data_inicio + timedelta(days=int(dias_validos[saida]))
+            periodos.append({
+                'data_inicio': _formatar_data(inicio_periodo),
+                'data_fim': _formatar_data(data_saida),
+                'duracao_dias': (data_saida - inicio_periodo).days,
+                'orbe_maximo_atingido': round(float(orbes[saida]), 2)
+            })
+        
+        # Finalizar último período se ainda ativo
+        if len(entradas) > len(saidas):
+            inicio_periodo = data_inicio + timedelta(days=int(dias_validos[entradas[-1]]))
+            periodos.append({
+                'data_inicio': _formatar_data(inicio_periodo),
+                'data_fim': _formatar_data(data_fim),
+                'duracao_dias': (data_fim - inicio_periodo).days,
+                'orbe_maximo_atingido': orbe_max
+            })
+        
+        return periodos
+    
     def determinar_casa_natal_por_longitude(self, longitude: float, casas_natais: List[Dict]) -> int:
         """Determina a casa natal baseada na longitude e cúspides das casas"""
         try:
@@ -1019,7 +1276,7 @@ class TransitoAstrologicoPreciso:
             return 1  # Fallback
             
         except Exception as e:
-            logger.error(f"Erro ao determinar casa: {e}")
+            logger.error("Erro ao determinar casa: %s", e)
             return 1
     
     def testar_urano_especifico(self) -> Dict:
@@ -1057,7 +1314,7 @@ class TransitoAstrologicoPreciso:
                 {"house": 12, "degree": 233.84}
             ]
             
-            logger.info(f"[v12.2] Testando Urano com data de referência: {self.data_referencia}")
+            logger.info("[v12.2] Testando Urano com data de referência: %s", self.data_referencia)
             
             # Processar usando a função corrigida v12.2
             resultado = self.processar_planeta_preciso_CORRIGIDO(urano_teste, natais_teste, cuspides_teste)
@@ -1067,7 +1324,7 @@ class TransitoAstrologicoPreciso:
             
             # Adicionar informações de teste
             resultado['teste_especifico'] = {
-                'data_referencia_usada': self.data_referencia.strftime('%Y-%m-%d'),
+                'data_referencia_usada': _formatar_data(self.data_referencia),
                 'validacao_bibliotecas': validacao,
                 'esperado_entrada': '2025-07-07',
                 'esperado_saida': '2025-11-08',
@@ -1080,12 +1337,12 @@ class TransitoAstrologicoPreciso:
                 ]
             }
             
-            logger.info(f"[v12.2] Teste Urano concluído: Entrada={resultado['data_entrada_signo']}, Saída={resultado['data_saida_signo']}")
+            logger.info("[v12.2] Teste Urano concluído: Entrada=%s, Saída=%s", resultado['data_entrada_signo'], resultado['data_saida_signo'])
             
             return resultado
             
         except Exception as e:
-            logger.error(f"[v12.2] Erro no teste específico de Urano: {e}")
+            logger.error("[v12.2] Erro no teste específico de Urano: %s", e)
             return {'erro': str(e)}
     
     def refinar_inicio_retrogradacao(self, planeta: str, data_aproximada: datetime) -> str:
@@ -1095,18 +1352,16 @@ class TransitoAstrologicoPreciso:
             for dias in range(0, 30):
                 data_teste = data_aproximada - timedelta(days=dias)
                 
-                pos = self.calcular_posicao_planeta_swisseph(planeta, data_teste)
-                if not pos:
-                    pos = self.calcular_posicao_planeta_ephem(planeta, data_teste)
+                pos = self.calcular_posicao_planeta(planeta, data_teste)
                 
-                if pos and pos.get('velocidade', 0) >= 0:
-                    return (data_teste + timedelta(days=1)).strftime('%Y-%m-%d')
+                if pos and pos.velocidade >= 0:
+                    return _formatar_data(data_teste + timedelta(days=1))
             
-            return data_aproximada.strftime('%Y-%m-%d')
+            return _formatar_data(data_aproximada)
             
         except Exception as e:
-            logger.error(f"Erro ao refinar início de retrogradação: {e}")
-            return data_aproximada.strftime('%Y-%m-%d')
+            logger.error("Erro ao refinar início de retrogradação: %s", e)
+            return _formatar_data(data_aproximada)
     
     def refinar_fim_retrogradacao(self, planeta: str, data_aproximada: datetime) -> str:
         """Refina o fim exato da retrogradação"""
@@ -1115,18 +1370,16 @@ class TransitoAstrologicoPreciso:
             for dias in range(0, 90):
                 data_teste = data_aproximada + timedelta(days=dias)
                 
-                pos = self.calcular_posicao_planeta_swisseph(planeta, data_teste)
-                if not pos:
-                    pos = self.calcular_posicao_planeta_ephem(planeta, data_teste)
+                pos = self.calcular_posicao_planeta(planeta, data_teste)
                 
-                if pos and pos.get('velocidade', 0) >= 0:
-                    return data_teste.strftime('%Y-%m-%d')
+                if pos and pos.velocidade >= 0:
+                    return _formatar_data(data_teste)
             
-            return (data_aproximada + timedelta(days=60)).strftime('%Y-%m-%d')
+            return _formatar_data(data_aproximada + timedelta(days=60))
             
         except Exception as e:
-            logger.error(f"Erro ao refinar fim de retrogradação: {e}")
-            return data_aproximada.strftime('%Y-%m-%d')
+            logger.error("Erro ao refinar fim de retrogradação: %s", e)
+            return _formatar_data(data_aproximada)
     
     def obter_velocidade_planeta(self, planeta: str) -> Dict:
         """Retorna informações sobre velocidade do planeta"""
@@ -1232,7 +1485,7 @@ class TransitoAstrologicoPreciso:
                     }
                     
                 except Exception as e:
-                    logger.error(f"Erro ao calcular {nome_planeta} natal: {e}")
+                    logger.error("Erro ao calcular %s natal: %s", nome_planeta, e)
             
             # Adicionar Ascendente
             planetas_natais['Ascendente'] = {
@@ -1258,7 +1511,7 @@ class TransitoAstrologicoPreciso:
             }
             
         except Exception as e:
-            logger.error(f"Erro ao calcular mapa natal: {e}")
+            logger.error("Erro ao calcular mapa natal: %s", e)
             raise
 
     def calcular_transitos_para_data(self, dados_transito: Dict, mapa_natal: Dict) -> Dict:
@@ -1283,19 +1536,20 @@ class TransitoAstrologicoPreciso:
                 data_utc.hour + data_utc.minute/60.0
             )
             
+            # Os cálculos autônomos amostram ao meio-dia e só dependem do dia:
+            # normalizar a data aproveita a memoização entre requisições
+            dia_transito = datetime(data_transito.year, data_transito.month, data_transito.day)
+            
             # Calcular posições dos planetas em trânsito
             planetas_transito = {}
             
-            for nome_planeta, id_swe in self.planetas_swe.items():
-                if nome_planeta not in self.planetas_relevantes:
-                    continue
-                
+            for nome_planeta, id_swe in self.planetas_swe_relevantes:
                 try:
                     resultado = swe.calc_ut(jd_ut, id_swe)
                     
                     # Verificar se o resultado é válido
                     if not resultado or len(resultado) == 0 or len(resultado[0]) < 4:
-                        logger.error(f"Resultado inválido para {nome_planeta}: {resultado}")
+                        logger.error("Resultado inválido para %s: %s", nome_planeta, resultado)
                         continue
                     
                     longitude = resultado[0][0]
@@ -1318,15 +1572,15 @@ class TransitoAstrologicoPreciso:
                     
                     # Calcular períodos de entrada/saída do signo
                     entrada_signo = self.calcular_entrada_signo_autonoma(
-                        nome_planeta, signo_index, data_transito
+                        nome_planeta, signo_index, dia_transito
                     )
                     saida_signo = self.calcular_saida_signo_autonoma(
-                        nome_planeta, signo_index, data_transito
+                        nome_planeta, signo_index, dia_transito
                     )
                     
                     # Detectar retrogradações próximas
                     retrogradacoes = self.detectar_retrogradacoes_autonomas(
-                        nome_planeta, data_transito
+                        nome_planeta, dia_transito
                     )
                     
                     planetas_transito[nome_planeta] = {
@@ -1343,17 +1597,59 @@ class TransitoAstrologicoPreciso:
                     }
                     
                 except Exception as e:
-                    logger.error(f"Erro ao calcular {nome_planeta} em trânsito: {e}")
+                    logger.error("Erro ao calcular %s em trânsito: %s", nome_planeta, e)
             
             return planetas_transito
             
         except Exception as e:
-            logger.error(f"Erro ao calcular trânsitos: {e}")
+            logger.error("Erro ao calcular trânsitos: %s", e)
             raise
 
+    def _preparar_casas(self, cuspides: List[Dict]):
+        """
+        Prepara limites ordenados das cúspides e casas correspondentes (cache por lista).
+        Só mapas com exatamente 12 cúspides numéricas usam a busca binária; nos demais
+        retorna (None, None) e a casa sai da varredura linear
+        """
+        cache = self._casas_preparadas
+        if cache is not None and cache[0] is cuspides:
+            return cache[1], cache[2]
+        
+        limites = casas = None
+        if isinstance(cuspides, list) and len(cuspides) == 12 and all(
+            isinstance(cuspide, dict)
+            and type(cuspide.get('degree')) in (int, float) and math.isfinite(cuspide['degree'])
+            and type(cuspide.get('house')) is int
+            for cuspide in cuspides
+        ):
+            limites, casas = _limites_cuspides(
+                tuple(float(cuspide['degree']) for cuspide in cuspides),
+                tuple(cuspide['house'] for cuspide in cuspides)
+            )
+        
+        self._casas_preparadas = (cuspides, limites, casas)
+        return limites, casas
+
+    def determinar_casas_por_cuspides(self, longitudes: np.ndarray, cuspides: List[Dict]) -> np.ndarray:
+        """Versão vetorizada de determinar_casa_por_cuspides para várias longitudes"""
+        limites, casas = self._preparar_casas(cuspides)
+        
+        # Busca binária só com longitudes em [0, 360): fora disso vale a varredura linear sobre o valor bruto
+        if limites is not None and np.all((longitudes >= 0) & (longitudes < 360)):
+            # Índice -1 (antes da menor cúspide) volta para a casa que cruza 0°
+            indices = (np.searchsorted(limites, longitudes, side='right') - 1) % 12
+            return casas[indices]
+        
+        return np.array([self.determinar_casa_por_cuspides(longitude, cuspides) for longitude in longitudes.tolist()])
+
     def determinar_casa_por_cuspides(self, longitude: float, cuspides: List[Dict]) -> int:
         """FUNÇÃO CHAVE: Determina casa baseada nas cúspides Placidus"""
         try:
+            limites, casas = self._preparar_casas(cuspides)
+            
+            if limites is not None and 0 <= longitude < 360:
+                return int(_casa_por_limites(longitude, limites, casas))
+            
             for i in range(12):
                 cusp_atual = cuspides[i]['degree'] % 360
                 cusp_proxima = cuspides[(i + 1) % 12]['degree'] % 360
@@ -1369,66 +1665,90 @@ class TransitoAstrologicoPreciso:
             return 1  # Fallback
             
         except Exception as e:
-            logger.error(f"Erro ao determinar casa: {e}")
+            logger.error("Erro ao determinar casa: %s", e)
             return 1
 
+    def _preparar_planetas_natais(self, planetas_natais: Dict):
+        """Extrai nomes, longitudes e casas do mapa natal uma única vez (cache por dicionário)"""
+        cache = self._planetas_natais_preparados
+        if cache is not None and cache[0] is planetas_natais:
+            return cache[1]
+        
+        # Pular alguns pontos
+        itens = [(nome, dados) for nome, dados in planetas_natais.items() if nome not in ['Meio_do_Ceu']]
+        preparados = (
+            [nome for nome, _ in itens],
+            np.array([dados['longitude'] for _, dados in itens], dtype=np.float64),
+            [dados['casa'] for _, dados in itens]
+        )
+        
+        self._planetas_natais_preparados = (planetas_natais, preparados)
+        return preparados
+
     def calcular_aspectos_transito_natal(self, long_transito: float, planetas_natais: Dict) -> List[Dict]:
         """Calcula aspectos entre planeta em trânsito e planetas natais"""
         try:
-            aspectos = []
-            
-            for nome_natal, dados_natal in planetas_natais.items():
-                if nome_natal in ['Meio_do_Ceu']:  # Pular alguns pontos
-                    continue
-                
-                long_natal = dados_natal['longitude']
-                
-                # Calcular diferença angular
-                diferenca = abs(long_transito - long_natal)
-                diferenca = min(diferenca, 360 - diferenca)
-                
-                # Verificar aspectos maiores
-                for angulo, nome_aspecto, orbe_max in self.aspectos:
-                    orbe = abs(diferenca - angulo)
-                    if orbe <= orbe_max:
-                        aspectos.append({
-                            'tipo_aspecto': nome_aspecto,
-                            'planeta_natal': nome_natal,
-                            'casa_natal': dados_natal['casa'],
-                            'orbe': round(orbe, 2),
-                            'orbe_maximo': orbe_max,
-                            'exatidao': round((1 - orbe/orbe_max) * 100, 1)
-                        })
-                        break
-            
-            # Ordenar por exatidão
-            return sorted(aspectos, key=lambda x: x['orbe'])
+            nomes_natais, longitudes_natais, casas_natais = self._preparar_planetas_natais(planetas_natais)
+            return self._aspectos_em_orbe(long_transito, nomes_natais, longitudes_natais, casas_natais)
             
         except Exception as e:
-            logger.error(f"Erro ao calcular aspectos: {e}")
+            logger.error("Erro ao calcular aspectos: %s", e)
             return []
 
+    def _dias_seguros_no_signo(self, planeta: str, signo_index: int, data_ref: datetime) -> int:
+        """
+        Número de dias (para frente ou para trás) em que o planeta certamente
+        permanece no signo: distância até a borda mais próxima do signo
+        dividida pela velocidade máxima do planeta
+        """
+        velocidade_maxima = self.velocidade_maxima.get(planeta)
+        if not velocidade_maxima:
+            return 0
+        
+        jd_ut = swe.julday(data_ref.year, data_ref.month, data_ref.day, 12.0)
+        longitude = swe.calc_ut(jd_ut, self.planetas_swe[planeta])[0][0]
+        if int(longitude // 30) != signo_index:
+            return 0
+        
+        grau_no_signo = longitude % 30
+        distancia = min(grau_no_signo, 30 - grau_no_signo)
+        return int(distancia / velocidade_maxima)
+
+    def _passo_seguro_no_signo(self, planeta: str, longitude: float) -> int:
+        """Dias até a próxima amostra em que o planeta, hoje em `longitude`, pode ter saído do signo (mínimo 1)"""
+        velocidade_maxima = self.velocidade_maxima.get(planeta)
+        if not velocidade_maxima:
+            return 1
+        
+        grau_no_signo = longitude % 30
+        return max(1, int(min(grau_no_signo, 30 - grau_no_signo) / velocidade_maxima))
+
     def calcular_entrada_signo_autonoma(self, planeta: str, signo_index: int, data_ref: datetime) -> str:
         """Calcula entrada no signo usando Swiss Ephemeris"""
         try:
-            # Buscar para trás até encontrar mudança de signo
-            for dias in range(0, 1000):  # Até ~3 anos
-                data_teste = data_ref - timedelta(days=dias)
-                
-                jd_ut = swe.julday(data_teste.year, data_teste.month, data_teste.day, 12.0)
-                resultado = swe.calc_ut(jd_ut, self.planetas_swe[planeta])
-                longitude = resultado[0][0]
+            # Pular os dias em que o planeta não pode ter mudado de signo
+            dias = self._dias_seguros_no_signo(planeta, signo_index, data_ref)
+            id_planeta = self.planetas_swe[planeta]
+            jd_ref = swe.julday(data_ref.year, data_ref.month, data_ref.day, 12.0)
+            
+            # Buscar para trás até encontrar mudança de signo (até ~3 anos)
+            while dias < 1000:
+                # Meio-dia é dia juliano inteiro: jd_ref - dias é exatamente o meio-dia da data testada
+                longitude = swe.calc_ut(jd_ref - dias, id_planeta)[0][0]
                 signo_teste = int(longitude // 30)
                 
                 if signo_teste != signo_index:
                     # Encontrou mudança - refinar
+                    data_teste = data_ref - timedelta(days=dias)
                     return self.refinar_mudanca_signo(planeta, data_teste, data_teste + timedelta(days=1))
+                
+                dias += self._passo_seguro_no_signo(planeta, longitude)
             
-            return (data_ref - timedelta(days=30)).strftime('%Y-%m-%d')
+            return _formatar_data(data_ref - timedelta(days=30))
             
         except Exception as e:
-            logger.error(f"Erro entrada signo: {e}")
-            return data_ref.strftime('%Y-%m-%d')
+            logger.error("Erro entrada signo: %s", e)
+            return _formatar_data(data_ref)
 
     def calcular_saida_signo_autonoma(self, planeta: str, signo_index: int, data_ref: datetime) -> str:
         """Calcula saída do signo usando Swiss Ephemeris"""
@@ -1440,51 +1760,57 @@ class TransitoAstrologicoPreciso:
             
             limite = periodos.get(planeta, 400)
             
+            # Pular os dias em que o planeta não pode ter mudado de signo
+            dias = max(1, self._dias_seguros_no_signo(planeta, signo_index, data_ref))
+            id_planeta = self.planetas_swe[planeta]
+            jd_ref = swe.julday(data_ref.year, data_ref.month, data_ref.day, 12.0)
+            
             # Buscar para frente até encontrar mudança de signo
-            for dias in range(1, limite):
-                data_teste = data_ref + timedelta(days=dias)
-                
-                jd_ut = swe.julday(data_teste.year, data_teste.month, data_teste.day, 12.0)
-                resultado = swe.calc_ut(jd_ut, self.planetas_swe[planeta])
-                longitude = resultado[0][0]
+            while dias < limite:
+                longitude = swe.calc_ut(jd_ref + dias, id_planeta)[0][0]
                 signo_teste = int(longitude // 30)
                 
                 if signo_teste != signo_index:
                     # Encontrou mudança - refinar
+                    data_teste = data_ref + timedelta(days=dias)
                     return self.refinar_mudanca_signo(planeta, data_teste - timedelta(days=1), data_teste)
+                
+                dias += self._passo_seguro_no_signo(planeta, longitude)
             
-            return (data_ref + timedelta(days=limite)).strftime('%Y-%m-%d')
+            return _formatar_data(data_ref + timedelta(days=limite))
             
         except Exception as e:
-            logger.error(f"Erro saída signo: {e}")
-            return (data_ref + timedelta(days=400)).strftime('%Y-%m-%d')
+            logger.error("Erro saída signo: %s", e)
+            return _formatar_data(data_ref + timedelta(days=400))
 
     def refinar_mudanca_signo(self, planeta: str, data_antes: datetime, data_depois: datetime) -> str:
         """Refina data exata de mudança usando busca binária"""
         try:
+            id_planeta = self.planetas_swe[planeta]
+            
+            # Signo anterior: data_antes só avança para datas no mesmo signo
+            jd_antes = swe.julday(data_antes.year, data_antes.month, data_antes.day, 12.0)
+            resultado_antes = swe.calc_ut(jd_antes, id_planeta)
+            signo_antes = int(resultado_antes[0][0] // 30)
+            
             while (data_depois - data_antes).days > 0:
                 data_meio = data_antes + (data_depois - data_antes) / 2
                 
                 jd_ut = swe.julday(data_meio.year, data_meio.month, data_meio.day, 12.0)
-                resultado = swe.calc_ut(jd_ut, self.planetas_swe[planeta])
+                resultado = swe.calc_ut(jd_ut, id_planeta)
                 longitude = resultado[0][0]
                 signo_meio = int(longitude // 30)
                 
-                # Comparar com signo anterior
-                jd_antes = swe.julday(data_antes.year, data_antes.month, data_antes.day, 12.0)
-                resultado_antes = swe.calc_ut(jd_antes, self.planetas_swe[planeta])
-                signo_antes = int(resultado_antes[0][0] // 30)
-                
                 if signo_meio == signo_antes:
                     data_antes = data_meio
                 else:
                     data_depois = data_meio
             
-            return data_depois.strftime('%Y-%m-%d')
+            return _formatar_data(data_depois)
             
         except Exception as e:
-            logger.error(f"Erro refinar mudança: {e}")
-            return data_depois.strftime('%Y-%m-%d')
+            logger.error("Erro refinar mudança: %s", e)
+            return _formatar_data(data_depois)
 
     def detectar_retrogradacoes_autonomas(self, planeta: str, data_ref: datetime) -> List[Dict]:
         """Detecta retrogradações próximas usando Swiss Ephemeris"""
@@ -1493,76 +1819,84 @@ class TransitoAstrologicoPreciso:
                 return None
             
             retrogradacoes = []
+            id_planeta = self.planetas_swe[planeta]
+            # Meio-dia é dia juliano inteiro: o meio-dia de data_ref + n dias é jd_ref + n
+            jd_ref = swe.julday(data_ref.year, data_ref.month, data_ref.day, 12.0)
+            
+            # Primeiro dia retrógrado nos próximos 400 dias: amostras a cada 5 dias e bisseção
+            # no passo em que a velocidade fica negativa (nenhuma retrogradação dura menos que isso)
+            dias = _primeiro_dia_com_estado(lambda dia: swe.calc_ut(jd_ref + dia, id_planeta)[0][3] < 0, 0, 400, True, passo=5)
             
-            # Buscar nos próximos 400 dias
-            for dias in range(0, 400):
+            if dias is not None:  # Só primeira retrogradação
                 data_teste = data_ref + timedelta(days=dias)
                 
-                jd_ut = swe.julday(data_teste.year, data_teste.month, data_teste.day, 12.0)
-                resultado = swe.calc_ut(jd_ut, self.planetas_swe[planeta])
-                velocidade = resultado[0][3]
+                # Encontrar período completo
+                inicio = self.encontrar_inicio_retrogradacao(planeta, data_teste)
+                fim = self.encontrar_fim_retrogradacao(planeta, data_teste)
                 
-                if velocidade < 0:  # Retrógrado
-                    # Encontrar período completo
-                    inicio = self.encontrar_inicio_retrogradacao(planeta, data_teste)
-                    fim = self.encontrar_fim_retrogradacao(planeta, data_teste)
-                    
-                    retrogradacoes.append({
-                        'data_inicio': inicio,
-                        'data_fim': fim,
-                        'duracao_dias': (datetime.strptime(fim, '%Y-%m-%d') - 
-                                       datetime.strptime(inicio, '%Y-%m-%d')).days
-                    })
-                    
-                    break  # Só primeira retrogradação
+                retrogradacoes.append({
+                    'data_inicio': inicio,
+                    'data_fim': fim,
+                    'duracao_dias': (datetime.strptime(fim, '%Y-%m-%d') - 
+                                   datetime.strptime(inicio, '%Y-%m-%d')).days
+                })
             
             return retrogradacoes if retrogradacoes else None
             
         except Exception as e:
-            logger.error(f"Erro detectar retrogradação: {e}")
+            logger.error("Erro detectar retrogradação: %s", e)
             return None
 
     def encontrar_inicio_retrogradacao(self, planeta: str, data_aprox: datetime) -> str:
         """Encontra início exato da retrogradação"""
         try:
-            for dias in range(0, 60):
-                data_teste = data_aprox - timedelta(days=dias)
-                
-                jd_ut = swe.julday(data_teste.year, data_teste.month, data_teste.day, 12.0)
-                resultado = swe.calc_ut(jd_ut, self.planetas_swe[planeta])
-                velocidade = resultado[0][3]
-                
-                if velocidade >= 0:  # Ainda direto
-                    return (data_teste + timedelta(days=1)).strftime('%Y-%m-%d')
+            id_planeta = self.planetas_swe[planeta]
+            jd_aprox = swe.julday(data_aprox.year, data_aprox.month, data_aprox.day, 12.0)
             
-            return data_aprox.strftime('%Y-%m-%d')
+            # Primeiro dia para trás ainda direto (amostragem semanal + bisseção)
+            dias = _primeiro_dia_com_estado(lambda dia: swe.calc_ut(jd_aprox - dia, id_planeta)[0][3] >= 0, 0, 60, True)
+            if dias is not None:
+                return _formatar_data(data_aprox - timedelta(days=dias) + timedelta(days=1))
+            
+            return _formatar_data(data_aprox)
             
         except Exception as e:
-            logger.error(f"Erro início retrogradação: {e}")
-            return data_aprox.strftime('%Y-%m-%d')
+            logger.error("Erro início retrogradação: %s", e)
+            return _formatar_data(data_aprox)
 
     def encontrar_fim_retrogradacao(self, planeta: str, data_aprox: datetime) -> str:
         """Encontra fim exato da retrogradação"""
         try:
-            for dias in range(0, 150):
-                data_teste = data_aprox + timedelta(days=dias)
-                
-                jd_ut = swe.julday(data_teste.year, data_teste.month, data_teste.day, 12.0)
-                resultado = swe.calc_ut(jd_ut, self.planetas_swe[planeta])
-                velocidade = resultado[0][3]
-                
-                if velocidade >= 0:  # Voltou a direto
-                    return data_teste.strftime('%Y-%m-%d')
+            id_planeta = self.planetas_swe[planeta]
+            jd_aprox = swe.julday(data_aprox.year, data_aprox.month, data_aprox.day, 12.0)
+            
+            # Primeiro dia em que voltou a direto (amostragem semanal + bisseção)
+            dias = _primeiro_dia_com_estado(lambda dia: swe.calc_ut(jd_aprox + dia, id_planeta)[0][3] >= 0, 0, 150, True)
+            if dias is not None:
+                return _formatar_data(data_aprox + timedelta(days=dias))
             
-            return (data_aprox + timedelta(days=90)).strftime('%Y-%m-%d')
+            return _formatar_data(data_aprox + timedelta(days=90))
             
         except Exception as e:
-            logger.error(f"Erro fim retrogradação: {e}")
-            return data_aprox.strftime('%Y-%m-%d')
+            logger.error("Erro fim retrogradação: %s", e)
+            return _formatar_data(data_aprox)
 
 # ============ ENDPOINTS ============
 calc = TransitoAstrologicoPreciso()
 
+# Sem bibliotecas astronômicas os endpoints de cálculo respondem 500: avisar já na carga (também sob uvicorn/Docker)
+if not SWISSEPH_DISPONIVEL and not PYEPHEM_DISPONIVEL:
+    logger.warning("Nenhuma biblioteca astronômica instalada (pyswisseph/ephem): endpoints de cálculo indisponíveis")
+
+# Cache LRU das respostas de /transitos-especificos, por dia e hash da entrada
+_cache_transitos_especificos: "OrderedDict[tuple, List[Dict]]" = OrderedDict()
+_CACHE_TRANSITOS_MAXIMO = 1024
+
+def _chave_cache_transitos(data: Any) -> tuple:
+    """Chave do cache: dia atual + hash da entrada canonicalizada"""
+    payload = json.dumps(data, sort_keys=True, default=str).encode()
+    return (date.today().toordinal(), hashlib.blake2b(payload).digest())
+
 @app.post("/calcular-transitos-completo")
 async def calcular_transitos_completo(data: Dict[str, Any]):
     """
@@ -1600,13 +1934,15 @@ async def calcular_transitos_completo(data: Dict[str, Any]):
                     detail=f"Campo obrigatório ausente: {campo}"
                 )
         
+        # Cálculos síncronos (CPU) rodam numa thread para não bloquear o event loop
+        
         # CALCULAR MAPA NATAL PRIMEIRO (cúspides Placidus)
         logger.info("📊 Calculando mapa natal com cúspides Placidus...")
-        mapa_natal = calc.calcular_mapa_natal_completo(dados_natal)
+        mapa_natal = await asyncio.to_thread(calc.calcular_mapa_natal_completo, dados_natal)
         
         # CALCULAR TRÂNSITOS PARA A DATA ESPECIFICADA
         logger.info("🌟 Calculando trânsitos com precisão astronômica...")
-        transitos = calc.calcular_transitos_para_data(dados_transito, mapa_natal)
+        transitos = await asyncio.to_thread(calc.calcular_transitos_para_data, dados_transito, mapa_natal)
         
         return {
             "status": "sucesso",
@@ -1631,7 +1967,7 @@ async def calcular_transitos_completo(data: Dict[str, Any]):
         }
         
     except Exception as e:
-        logger.error(f"❌ Erro no cálculo completo: {e}")
+        logger.error("❌ Erro no cálculo completo: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/")
@@ -1684,6 +2020,31 @@ async def health():
         "skyfield": SKYFIELD_DISPONIVEL
     }
 
+@app.get("/cache-stats")
+async def cache_stats():
+    """Diagnóstico: acertos, faltas e ocupação dos caches de cálculo"""
+    caches_lru = {
+        'posicao_swisseph': calc.calcular_posicao_planeta_swisseph,
+        'posicao_ephem': calc.calcular_posicao_planeta_ephem,
+        'posicao_swisseph_jd': calc._posicao_swisseph_jd,
+        'posicao_ephem_data': calc._posicao_ephem_data,
+        'grade_posicoes': calc._grade_posicoes,
+        'primeira_retrogradacao': calc._primeira_retrogradacao,
+        'entrada_signo_precisa': calc.calcular_entrada_signo_precisa,
+        'saida_signo_precisa': calc.calcular_saida_signo_precisa,
+        'entrada_signo_autonoma': calc.calcular_entrada_signo_autonoma,
+        'saida_signo_autonoma': calc.calcular_saida_signo_autonoma,
+        'retrogradacoes_autonomas': calc.detectar_retrogradacoes_autonomas,
+        'limites_cuspides': _limites_cuspides
+    }
+    
+    estatisticas = {nome: cache.cache_info()._asdict() for nome, cache in caches_lru.items()}
+    estatisticas['transitos_especificos'] = {
+        'currsize': len(_cache_transitos_especificos),
+        'maxsize': _CACHE_TRANSITOS_MAXIMO
+    }
+    return estatisticas
+
 @app.get("/teste-urano")
 async def teste_urano():
     """Endpoint para testar as correções específicas do Urano"""
@@ -1721,7 +2082,7 @@ async def transitos_simplificados(data: List[Dict[str, Any]]):
     Análise baseada exclusivamente em: longitude atual vs cúspides das casas
     """
     try:
-        logger.info(f"[SIMPLIFICADO] Processando {len(data)} elementos")
+        logger.info("[SIMPLIFICADO] Processando %d elementos", len(data))
         
         # Processar diferentes formatos de dados
         dados_internos = []
@@ -1729,10 +2090,10 @@ async def transitos_simplificados(data: List[Dict[str, Any]]):
         # Verificar se é formato com wrapper: [{"json": [...]}]
         if len(data) == 1 and isinstance(data[0], dict) and 'json' in data[0]:
             dados_internos = data[0]['json']
-            logger.info(f"[SIMPLIFICADO] Extraindo {len(dados_internos)} elementos do wrapper json")
+            logger.info("[SIMPLIFICADO] Extraindo %d elementos do wrapper json", len(dados_internos))
         else:
             dados_internos = data
-            logger.info(f"[SIMPLIFICADO] Processando {len(dados_internos)} elementos diretos")
+            logger.info("[SIMPLIFICADO] Processando %d elementos diretos", len(dados_internos))
         
         # Garantir que dados_internos é uma lista
         if not isinstance(dados_internos, list):
@@ -1752,11 +2113,11 @@ async def transitos_simplificados(data: List[Dict[str, Any]]):
                 elif 'houses' in item:
                     # Cúspides das casas
                     casas_natais = item['houses']
-                    logger.info(f"[SIMPLIFICADO] Encontradas {len(casas_natais)} cúspides")
+                    logger.info("[SIMPLIFICADO] Encontradas %d cúspides", len(casas_natais))
                 elif 'transitos' in item:
                     # Dados de trânsitos
                     transitos_dados = item['transitos']
-                    logger.info(f"[SIMPLIFICADO] Encontrados dados de trânsitos")
+                    logger.info("[SIMPLIFICADO] Encontrados dados de trânsitos")
                 elif 'status' in item:
                     # Dados gerais
                     dados_gerais = item
@@ -1783,7 +2144,7 @@ async def transitos_simplificados(data: List[Dict[str, Any]]):
                     }
                     planetas_transito.append(planeta_convertido)
         
-        logger.info(f"[SIMPLIFICADO] Processando {len(planetas_transito)} planetas em trânsito")
+        logger.info("[SIMPLIFICADO] Processando %d planetas em trânsito", len(planetas_transito))
         
         # Processar cada planeta de forma simplificada
         planetas_processados = {}
@@ -1791,7 +2152,8 @@ async def transitos_simplificados(data: List[Dict[str, Any]]):
         for transito in planetas_transito:
             nome = transito.get('name')
             if nome:
-                logger.info(f"[SIMPLIFICADO] Processando {nome}")
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info("[SIMPLIFICADO] Processando %s", nome)
                 
                 # Análise simplificada: apenas posição atual na casa
                 signo = transito.get('sign', 'Áries')
@@ -1871,7 +2233,7 @@ async def transitos_simplificados(data: List[Dict[str, Any]]):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"[SIMPLIFICADO] Erro geral: {e}")
+        logger.error("[SIMPLIFICADO] Erro geral: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/transitos-especificos")
@@ -1884,7 +2246,7 @@ async def transitos_especificos(data: List[Dict[str, Any]]):
                 detail="Nenhuma biblioteca astronômica disponível. Instale: pip install pyswisseph"
             )
         
-        logger.info(f"[v12.2] Processando trânsitos específicos para {len(data)} elementos")
+        logger.info("[v12.2] Processando trânsitos específicos para %s elementos", len(data))
         
         # Separar dados
         planetas_transito = []
@@ -1908,44 +2270,79 @@ async def transitos_especificos(data: List[Dict[str, Any]]):
         if casas_natais:
             calc.cuspides_cache = casas_natais
         
-        # Processar trânsitos específicos
-        transitos_especificos = []
+        # Sem cúspides no payload o resultado depende das cúspides de requisições anteriores
+        # (calc.cuspides_cache): a resposta não vai para o cache
+        chave_cache = _chave_cache_transitos(data) if casas_natais else None
+        if chave_cache is not None:
+            transitos_especificos = _cache_transitos_especificos.get(chave_cache)
+            if transitos_especificos is not None:
+                _cache_transitos_especificos.move_to_end(chave_cache)
+                logger.info("[v12.2] Trânsitos específicos servidos do cache")
+                return _resposta_transitos_especificos(transitos_especificos)
         
-        for planeta in planetas_transito:
-            nome = planeta.get('name', 'Desconhecido')
-            
-            # Filtrar apenas planetas relevantes (excluir Sol, Lua e Ascendente)
-            if nome not in calc.planetas_relevantes:
-                continue
-            
-            try:
-                transito = calc.calcular_transito_especifico(planeta, planetas_natais, casas_natais)
-                transitos_especificos.append(transito)
-            except Exception as e:
-                logger.error(f"[v12.2] Erro ao calcular trânsito específico de {nome}: {e}")
-                transitos_especificos.append({
-                    'planeta': nome,
-                    'erro': str(e)
-                })
+        # Filtrar apenas planetas relevantes (excluir Sol, Lua e Ascendente)
+        planetas_relevantes = [
+            planeta for planeta in planetas_transito
+            if planeta.get('name', 'Desconhecido') in calc.planetas_relevantes
+        ]
         
-        return {
-            "status": "sucesso",
-            "versao": "v12.2",
-            "total_transitos": len(transitos_especificos),
-            "data_calculo": datetime.now().isoformat(),
-            "data_referencia": calc.data_referencia.isoformat(),
-            "periodo_analise": "1 ano",
-            "bibliotecas_usadas": {
-                "swisseph": SWISSEPH_DISPONIVEL,
-                "pyephem": PYEPHEM_DISPONIVEL
-            },
-            "transitos_especificos": transitos_especificos
-        }
+        # Cúspides efetivas lidas aqui no event loop: a thread não acessa calc.cuspides_cache,
+        # que outra requisição pode trocar durante o cálculo
+        cuspides = casas_natais or calc.cuspides_cache or []
+        
+        # Cálculo fora do event loop (uma única thread para o lote: as bibliotecas de efemérides
+        # não liberam o GIL, então threads por planeta não rodariam em paralelo)
+        transitos_especificos = await asyncio.to_thread(
+            _calcular_transitos_especificos, planetas_relevantes, planetas_natais, casas_natais, cuspides
+        )
+        
+        # Só guardar no cache resultados sem erro
+        if chave_cache is not None and not any('erro' in transito for transito in transitos_especificos):
+            _cache_transitos_especificos[chave_cache] = transitos_especificos
+            if len(_cache_transitos_especificos) > _CACHE_TRANSITOS_MAXIMO:
+                _cache_transitos_especificos.popitem(last=False)
+        
+        return _resposta_transitos_especificos(transitos_especificos)
         
     except Exception as e:
-        logger.error(f"[v12.2] Erro geral no processamento de trânsitos específicos: {e}")
+        logger.error("[v12.2] Erro geral no processamento de trânsitos específicos: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
+def _calcular_transitos_especificos(planetas_relevantes: List[Dict], planetas_natais: List[Dict],
+                                    casas_natais: List[Dict], cuspides: List[Dict]) -> List[Dict]:
+    """Trânsito específico de cada planeta; erros de um planeta vão na própria entrada da resposta"""
+    transitos_especificos = []
+    
+    for planeta in planetas_relevantes:
+        try:
+            transito = calc.calcular_transito_especifico(planeta, planetas_natais, casas_natais, cuspides)
+        except Exception as e:
+            nome = planeta.get('name', 'Desconhecido')
+            logger.error("[v12.2] Erro ao calcular trânsito específico de %s: %s", nome, e)
+            transito = {
+                'planeta': nome,
+                'erro': str(e)
+            }
+        transitos_especificos.append(transito)
+    
+    return transitos_especificos
+
+def _resposta_transitos_especificos(transitos_especificos: List[Dict]) -> Dict:
+    """Monta a resposta de /transitos-especificos"""
+    return {
+        "status": "sucesso",
+        "versao": "v12.2",
+        "total_transitos": len(transitos_especificos),
+        "data_calculo": datetime.now().isoformat(),
+        "data_referencia": calc.data_referencia.isoformat(),
+        "periodo_analise": "1 ano",
+        "bibliotecas_usadas": {
+            "swisseph": SWISSEPH_DISPONIVEL,
+            "pyephem": PYEPHEM_DISPONIVEL
+        },
+        "transitos_especificos": transitos_especificos
+    }
+
 @app.post("/calcular-transitos-simples")
 async def calcular_transitos_simples(data: Any = Body(...)):
     """
@@ -1962,17 +2359,17 @@ async def calcular_transitos_simples(data: Any = Body(...)):
             )
         
         logger.info("🚀 Calculando trânsitos simples para data específica")
-        logger.info(f"Dados recebidos: {data}")
+        logger.debug("Dados recebidos: %s", data)
         
         # Normalizar dados (aceitar array ou objeto)
         if isinstance(data, list) and len(data) > 0:
             dados = data[0]  # Pegar primeiro elemento do array
-            logger.info(f"Dados normalizados (array): {dados}")
+            logger.debug("Dados normalizados (array): %s", dados)
         elif isinstance(data, dict):
             dados = data
-            logger.info(f"Dados normalizados (objeto): {dados}")
+            logger.debug("Dados normalizados (objeto): %s", dados)
         else:
-            logger.error(f"Formato inválido: {type(data)} - {data}")
+            logger.error("Formato inválido: %s - %s", type(data), data)
             raise HTTPException(
                 status_code=400,
                 detail="Formato inválido. Envie um objeto ou array com um objeto"
@@ -1987,8 +2384,8 @@ async def calcular_transitos_simples(data: Any = Body(...)):
                 campos_faltando.append(campo)
         
         if campos_faltando:
-            logger.error(f"Campos obrigatórios faltando: {campos_faltando}")
-            logger.error(f"Dados recebidos: {dados}")
+            logger.error("Campos obrigatórios faltando: %s", campos_faltando)
+            logger.error("Dados recebidos: %s", dados)
             raise HTTPException(
                 status_code=400,
                 detail=f"Campos obrigatórios ausentes: {', '.join(campos_faltando)}"
@@ -2016,16 +2413,13 @@ async def calcular_transitos_simples(data: Any = Body(...)):
         # Calcular posições dos planetas em trânsito (SIMPLES)
         planetas_transito = {}
         
-        for nome_planeta, id_swe in calc.planetas_swe.items():
-            if nome_planeta not in calc.planetas_relevantes:
-                continue
-            
+        for nome_planeta, id_swe in calc.planetas_swe_relevantes:
             try:
                 resultado = swe.calc_ut(jd_ut, id_swe)
                 
                 # Verificar se o resultado é válido
                 if not resultado or len(resultado) == 0 or len(resultado[0]) < 4:
-                    logger.error(f"Resultado inválido para {nome_planeta}: {resultado}")
+                    logger.error("Resultado inválido para %s: %s", nome_planeta, resultado)
                     continue
                 
                 longitude = resultado[0][0]
@@ -2047,7 +2441,7 @@ async def calcular_transitos_simples(data: Any = Body(...)):
                 }
                 
             except Exception as e:
-                logger.error(f"Erro ao calcular {nome_planeta} em trânsito: {e}")
+                logger.error("Erro ao calcular %s em trânsito: %s", nome_planeta, e)
         
         return {
             "status": "sucesso",
@@ -2064,7 +2458,7 @@ async def calcular_transitos_simples(data: Any = Body(...)):
         }
         
     except Exception as e:
-        logger.error(f"❌ Erro no cálculo simples: {e}")
+        logger.error("❌ Erro no cálculo simples: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 if __name__ == "__main__":
@@ -2088,4 +2482,18 @@ if __name__ == "__main__":
         print("\n⚠️  AVISO: Nenhuma biblioteca astronômica instalada!")
         print("📦 Instale: pip install pyswisseph")
     
-    uvicorn.run(app, host="0.0.0.0", port=8000, reload=False)
\ No newline at end of file
+    # Produção: vários workers (cálculo é CPU-bound); loop/http "auto" usam
+    # uvloop e httptools quando instalados (uvicorn[standard])
+    # Desenvolvimento (ASTRO_DEV=1 ou ASTRO_RELOAD=1): um processo com reload
+    modo_dev = os.getenv("ASTRO_DEV") == "1" or os.getenv("ASTRO_RELOAD") == "1"
+    workers = 1 if modo_dev else int(os.getenv("ASTRO_WORKERS", os.cpu_count() or 1))
+    print(f"Workers: {workers}{' (reload)' if modo_dev else ''}")
+    
+    uvicorn.run(
+        "main:app",
+        app_dir=os.path.dirname(os.path.abspath(__file__)),
+        host="0.0.0.0",
+        port=8000,
+        workers=workers,
+        reload=modo_dev
+    )
\ No newline at end of file
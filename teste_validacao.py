@@ -143,5 +143,41 @@ def testar_dados_cliente():
         except Exception as e:
             print(f"❌ Erro ao processar {data_str}: {e}")
 
+def testar_casas_cuspides_parciais():
+    """Casa por cúspides com lista parcial (menos de 12 cúspides): deve seguir a varredura linear"""
+    
+    import numpy as np
+    
+    calc = TransitoAstrologicoPreciso()
+    
+    print("🧪 TESTE DE CASAS - CÚSPIDES PARCIAIS")
+    print("=" * 50)
+    
+    cuspides_parciais = [
+        {"house": 1, "degree": 266.79}, {"house": 2, "degree": 290.77}, {"house": 3, "degree": 315.84},
+        {"house": 4, "degree": 344.76}, {"house": 5, "degree": 18.42}, {"house": 6, "degree": 53.84},
+    ]
+    
+    # Longitude -> casa esperada (mesmo resultado da varredura linear original)
+    casos = {270.0: 1, 300.0: 2, 320.0: 3, 350.0: 4, 5.0: 4, 30.0: 5}
+    
+    ok = True
+    for longitude, casa_esperada in casos.items():
+        casa = calc.determinar_casa_por_cuspides(longitude, cuspides_parciais)
+        correto = casa == casa_esperada
+        ok = ok and correto
+        print(f"   {longitude:6.1f}° -> Casa {casa} (esperada {casa_esperada}) {'✅ CORRETO' if correto else '❌ INCORRETO'}")
+    
+    casas = calc.determinar_casas_por_cuspides(np.array(list(casos), dtype=np.float64), cuspides_parciais).tolist()
+    correto = casas == list(casos.values())
+    ok = ok and correto
+    print(f"   Versão vetorizada: {casas} {'✅ CORRETO' if correto else '❌ INCORRETO'}")
+    print()
+    
+    return ok
+
 if __name__ == "__main__":
-    testar_dados_cliente() 
\ No newline at end of file
+    sucesso_casas = testar_casas_cuspides_parciais()
+    testar_dados_cliente()
+    if not sucesso_casas:
+        sys.exit(1) 
\ No newline at end of file